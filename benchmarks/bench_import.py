@@ -0,0 +1,42 @@
+"""Cold start: import of the package and construction of a client.
+
+Imports are timed in fresh interpreters, against an empty interpreter, and
+report whether `requests` was imported.
+
+    python benchmarks/bench_import.py
+"""
+import subprocess
+import sys
+import timeit
+
+N = 20
+IMPORT = ('import sys, time; t = time.perf_counter(); import coingecko_api; '
+          "print(time.perf_counter() - t, 'requests' in sys.modules)")
+
+
+def _import_time() -> float:
+    best = float('inf')
+    for _ in range(N):
+        out = subprocess.run([sys.executable, '-c', IMPORT],
+                             check=True,
+                             capture_output=True,
+                             text=True).stdout.split()
+        best = min(best, float(out[0]))
+    print(f'requests imported: {out[1]}')
+    return best
+
+
+def main() -> None:
+    print(f'{"import":>12}: {_import_time() * 1e3:.1f} ms')
+
+    from coingecko_api import CoinGeckoAPI
+
+    def construct():
+        CoinGeckoAPI().close()
+
+    seconds = min(timeit.repeat(construct, number=1000, repeat=5)) / 1000
+    print(f'{"construction":>12}: {seconds * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Per-call overhead of preparing requests.
+
+Compares preparing a `requests.Request` per call with the template based
+fast path of `CoinGeckoAPI._prepare`, without any network I/O.
+
+    python benchmarks/bench_request.py
+"""
+import timeit
+
+from requests import Request
+
+from coingecko_api import CoinGeckoAPI
+
+N = 20000
+PARAMS = {
+    'vs_currency': 'usd',
+    'order': 'market_cap_desc',
+    'per_page': 250,
+    'page': 1,
+    'sparkline': 'false'
+}
+
+
+def main() -> None:
+    cg = CoinGeckoAPI(headers={'x-cg-pro-api-key': 'key'})
+
+    def slow():
+        Request(method='GET',
+                url=cg._ENDPOINT + 'coins/markets',
+                params=PARAMS,
+                **cg.kwargs).prepare()
+
+    def fast():
+        cg._prepare('GET', 'coins/markets', PARAMS)
+
+    for name, func in (('Request.prepare', slow), ('fast path', fast)):
+        seconds = min(timeit.repeat(func, number=N, repeat=5)) / N
+        print(f'{name:>16}: {seconds * 1e6:.1f} us per call')
+    cg.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,104 @@
 import atexit
-from typing import Any, Dict, List, Optional, Union
+import importlib
+import threading
+import time
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, List, Mapping,
+                    Optional, Sequence, Tuple, Union)
+from urllib.parse import urlencode
 
-from requests import Request, Response, Session
+from ._deadline import bound_timeout
+from ._deadline import check as check_deadline
+from ._deadline import deadline, remaining
+from .metrics import Metrics, endpoint_of
+from .resilience import CircuitOpenError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from requests import PreparedRequest, Response, Session
+
+    from .budget import CreditBudget
+    from .cache import MemoryCache, SQLiteCache
+    from .ratelimit import RateLimiter
+    from .resilience import CircuitBreaker, Hedging
 
 __version__ = '0.2.0'
 
+# public names imported on first use, `requests` is only imported by the
+# first call of a client
+_LAZY = {
+    'BULK': 'ratelimit',
+    'DEFAULT': 'ratelimit',
+    'INTERACTIVE': 'ratelimit',
+    'PriorityScheduler': 'ratelimit',
+    'RateLimiter': 'ratelimit',
+    'SQLiteRateLimiter': 'ratelimit',
+    'current_priority': 'ratelimit',
+    'priority': 'ratelimit',
+    'MemoryCache': 'cache',
+    'OfflineError': 'cache',
+    'SQLiteCache': 'cache',
+    'BudgetExhausted': 'budget',
+    'CreditBudget': 'budget',
+    'DeadlineExceeded': 'exceptions',
+    'CircuitBreaker': 'resilience',
+    'Hedging': 'resilience',
+    'StreamResult': 'stream',
+    'stream_to': 'stream',
+    'HTTP2Session': 'transport',
+    'ThreadLocalSession': 'transport',
+    'create_session': 'transport'
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+# keyword arguments of `requests.Request` that do not depend on the call
+_STATIC_KWARGS = {'headers', 'cookies', 'auth'}
+
+# documented parameters trimming the heavy parts of the responses
+_LEAN_PARAMS = {
+    'get_coin': {
+        'localization': 'false',
+        'tickers': 'false',
+        'community_data': 'false',
+        'developer_data': 'false',
+        'sparkline': 'false'
+    },
+    'get_coin_history': {
+        'localization': 'false'
+    },
+    'get_coin_tickers': {
+        'include_exchange_logo': 'false',
+        'depth': 'false'
+    },
+    'list_coins_markets': {
+        'sparkline': 'false'
+    },
+    'get_exchange_tickers': {
+        'include_exchange_logo': 'false',
+        'depth': 'false'
+    }
+}
+
+# methods whose responses can be projected on `fields`
+_FIELDS_METHODS = {
+    'list_coins_markets', 'get_coin', 'get_coin_tickers', 'get_coin_history',
+    'get_token_info', 'get_exchange_volume', 'get_exchange_tickers',
+    'get_derivatives_exchange_info'
+}
+
 
 def _check_params(params):
     if params is not None and type(params) != dict:
@@ -12,45 +106,436 @@ def _check_params(params):
                           "{'order': 'market_cap_desc'}"))
 
 
+def _project(data: Any, fields: Sequence[str]) -> Any:
+    """Keep only `fields` of an object or of every object in a list."""
+    if isinstance(data, dict):
+        return {key: data[key] for key in fields if key in data}
+    if isinstance(data, list):
+        return [_project(item, fields) for item in data]
+    return data
+
+
+def _cache_key(method: str, path: str, params: Optional[dict]) -> str:
+    if not params:
+        return f'{method} {path}'
+    query = '&'.join(f'{k}={v}' for k, v in sorted(params.items())
+                     if v is not None)
+    return f'{method} {path}?{query}'
+
+
+def _close_response(future: 'Future') -> None:
+    if not future.cancelled() and future.exception() is None:
+        response = future.result()
+        if response is not None:
+            response.close()
+
+
 class CoinGeckoAPI:
     """Wrapper for CoinGecko API (V3).
 
     Args:
-        timeout (int): Seconds to wait for a request to fail.
+        timeout (float or tuple): Seconds to wait for a request to fail, or
+            separate `(connect, read)` timeouts. Both are capped by the
+            `deadline()` of the calls.
+        limiter (RateLimiter): Rate limiter shared by the calls, e.g.,
+            `RateLimiter(30)` for 30 calls per minute, or a
+            `PriorityScheduler` shared by several clients.
+        priority (str): Default priority class of the calls, overridden by
+            the `priority()` context manager.
+        lean (bool or list): Trim the responses of the heavy methods (e.g.,
+            no localization, tickers, community and developer data in
+            `get_coin`), either for all of them or for the given method
+            names. Parameters passed to the methods take precedence.
+        fields (dict): Top-level keys to keep in the responses per method
+            name, e.g., `{'get_coin': ['id', 'symbol', 'market_data']}`.
+        cache (MemoryCache): Cache of the responses, e.g., `MemoryCache()`
+            or `SQLiteCache(path)` shared by several processes.
+        cache_ttl (float): Seconds a cached response is fresh.
+        hedging (Hedging): Send a duplicate of the GET calls slower than the
+            recent latencies of their endpoint.
+        breaker (CircuitBreaker): Fail fast on consistently failing
+            endpoints, serving cached responses if any, even stale.
+        http2 (bool): Multiplex the calls over HTTP/2 connections with
+            `httpx`, falling back to HTTP/1.1 if the server does not support
+            it.
+        budget (CreditBudget): Count the credits used by the calls and pace
+            the low priority ones so that the monthly budget lasts.
+        thread_safe (bool): Send the calls of each thread on its own
+            `requests.Session`, so that one client can be shared by many
+            threads. The `http2` transport is always thread-safe.
+        transport (Session): Object sending the prepared requests instead
+            of a `requests.Session`, e.g., `cassette.ReplaySession(path)`.
+        offline (bool): Serve the calls from the cache only, even stale,
+            and raise `OfflineError` for the others.
+        compression (bool): Ask for compressed responses, with the best
+            content coding which can be decoded (see
+            `transport.accept_encoding()`), unless an `Accept-Encoding`
+            header is given.
         **kwargs (dict): additional keyword arguments to pass in `requests.Request`.
 
     Attributes:
-        timeout (int): Seconds to wait for a request to fail.
-        session (Session): Current `requests.Session` connection.
+        timeout (float or tuple): Seconds to wait for a request to fail.
+        limiter (RateLimiter): Rate limiter shared by the calls.
+        priority (str): Default priority class of the calls.
+        lean (set): Names of the methods with trimmed responses.
+        fields (dict): Top-level keys to keep in the responses per method.
+        cache (MemoryCache): Cache of the responses.
+        cache_ttl (float): Seconds a cached response is fresh.
+        hedging (Hedging): Hedging of the slow calls.
+        breaker (CircuitBreaker): Per endpoint circuit breaker.
+        metrics (Metrics): Per endpoint statistics of the calls.
+        budget (CreditBudget): Monthly credit budget of the calls.
+        offline (bool): Whether the calls are served from the cache only.
+        session (Session): Current `requests.Session` connection,
+            `ThreadLocalSession` with `thread_safe` or `HTTP2Session` with
+            `http2`, created by the first call. None once closed.
         kwargs (dict): additional keyword arguments to pass in `requests.Request`.
     """
     _ENDPOINT = 'https://api.coingecko.com/api/v3/'
+    _session: Optional['Session'] = None
+    _transport: Optional[Any] = None
+    _executor: Optional['ThreadPoolExecutor'] = None
+    _closed = False
+
+    def __init__(self,
+                 timeout: Union[float, Tuple[float, float]] = 5,
+                 limiter: Optional['RateLimiter'] = None,
+                 priority: Optional[str] = None,
+                 lean: Union[bool, Iterable[str]] = False,
+                 fields: Optional[Dict[str, Sequence[str]]] = None,
+                 cache: Union['MemoryCache', 'SQLiteCache', None] = None,
+                 cache_ttl: float = 60.0,
+                 hedging: Optional['Hedging'] = None,
+                 breaker: Optional['CircuitBreaker'] = None,
+                 http2: bool = False,
+                 budget: Optional['CreditBudget'] = None,
+                 thread_safe: bool = False,
+                 transport: Optional[Any] = None,
+                 offline: bool = False,
+                 compression: bool = True,
+                 **kwargs) -> None:
+        self._lock = threading.Lock()
+        if lean is True:
+            lean = _LEAN_PARAMS
+        elif lean is False:
+            lean = ()
+        unknown = set(lean) - set(_LEAN_PARAMS)
+        if unknown:
+            raise ValueError(f'No lean preset for {sorted(unknown)}, '
+                             f'available: {sorted(_LEAN_PARAMS)}')
+        unknown = set(fields or ()) - _FIELDS_METHODS
+        if unknown:
+            raise ValueError(f'No fields projection for {sorted(unknown)}, '
+                             f'available: {sorted(_FIELDS_METHODS)}')
+        if offline and cache is None:
+            raise ValueError('offline requires a cache.')
+        if priority is not None:
+            from .ratelimit import PRIORITIES
+            if priority not in PRIORITIES:
+                raise ValueError(
+                    f'priority should be one of {PRIORITIES}.')
 
-    def __init__(self, timeout: int = 5, **kwargs) -> None:
         self.timeout = timeout
+        self.limiter = limiter
+        self.priority = priority
+        self.lean = set(lean)
+        self.fields = fields or {}
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.hedging = hedging
+        self.breaker = breaker
+        self.budget = budget
+        self.offline = offline
+        self.metrics = Metrics()
         self.kwargs = kwargs
-        self.session = Session()
-        atexit.register(self.close)
+        self._executor: Optional['ThreadPoolExecutor'] = None
+        self._template: Optional['PreparedRequest'] = None
+        self._template_kwargs: Optional[dict] = None
+        # the session is created by the first call
+        self._transport = transport
+        self._http2 = http2
+        self._thread_safe = thread_safe
+        self._compression = compression
 
     def __del__(self) -> None:
         self.close()
 
+    @property
+    def session(self) -> Optional['Session']:
+        """Session sending the calls, created on first use, None once the
+        client is closed."""
+        if self._closed:
+            return None
+        return self._get_session()
+
+    def _get_session(self) -> 'Session':
+        session = self._session
+        if session is not None:
+            return session
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Session is already closed.')
+            if self._session is None:
+                if self._transport is not None:
+                    self._session = self._transport
+                elif self._http2:
+                    from .transport import HTTP2Session
+                    self._session = HTTP2Session()
+                elif self._thread_safe:
+                    from .transport import ThreadLocalSession
+                    self._session = ThreadLocalSession()
+                else:
+                    from .transport import create_session
+                    self._session = create_session()
+                atexit.register(self.close)
+            return self._session
+
     def _request(self,
                  path: str,
                  method: str = 'GET',
-                 params: Union[dict, None] = None) -> Any:
-        if self.session is None:
+                 params: Union[dict, None] = None,
+                 fields: Optional[Sequence[str]] = None) -> Any:
+        if self._closed:
             raise RuntimeError('Session is already closed.')
 
-        request = Request(method=method,
-                          url=self._ENDPOINT + path,
-                          params=params,
-                          **self.kwargs)
-        response = self.session.send(request.prepare(), timeout=self.timeout)
+        from .stream import current_target, write_response
+        target = current_target()
+        if target is not None:
+            response = self._send(path, method, params, stream=True)
+            if response.status_code >= 400:
+                response.close()
+                response.raise_for_status()
+            result = write_response(response, target)
+            self._record_transfer(endpoint_of(path), response, result.size)
+            return result
+
+        key = entry = None
+        if self.cache is not None and method == 'GET':
+            key = _cache_key(method, path, params)
+            entry = self.cache.get(key)
+            if entry is not None and (self.offline or
+                                      time.time() - entry[0] < self.cache_ttl):
+                data = entry[1]
+                return _project(data, fields) if fields is not None else data
 
-        return self._process_response(response)
+        try:
+            response = self._send(path, method, params)
+        except CircuitOpenError:
+            if entry is None:
+                raise
+            data = entry[1]
+            return _project(data, fields) if fields is not None else data
+
+        data = self._process_response(response)
+        if key is not None:
+            self.cache.set(key, data)
+        return _project(data, fields) if fields is not None else data
+
+    def _send(self,
+              path: str,
+              method: str = 'GET',
+              params: Union[dict, None] = None,
+              stream: bool = False) -> 'Response':
+        from requests.exceptions import RequestException
+
+        from .exceptions import DeadlineExceeded
+        from .ratelimit import current_priority
+        if self.offline:
+            from .cache import OfflineError
+            raise OfflineError(f'{method} {path} is not in the cache.')
+        endpoint = endpoint_of(path)
+        if self.breaker is not None:
+            self.breaker.allow(endpoint)
+        priority = current_priority(self.priority)
+        if self.budget is not None:
+            self.budget.acquire(priority)
+        if self.limiter is not None:
+            check_deadline()
+            self.limiter.acquire(priority)
+
+        request = self._prepare(method, path, params)
+        try:
+            timeout = bound_timeout(self.timeout)
+            if self.hedging is not None and method == 'GET' and not stream:
+                response = self._send_hedged(request, endpoint, priority,
+                                             timeout)
+            else:
+                response = self._transmit(request, endpoint, timeout, stream)
+        except RequestException as e:
+            left = remaining()
+            if left is not None and left <= 0:
+                # the deadline of the caller, not a failure of the endpoint
+                if isinstance(e, DeadlineExceeded):
+                    raise
+                raise DeadlineExceeded('Deadline exceeded.') from e
+            if self.breaker is not None:
+                self.breaker.record_failure(endpoint)
+            raise
 
-    def _process_response(self, response: Response) -> Any:
+        if self.breaker is not None:
+            if response.status_code >= 500:
+                self.breaker.record_failure(endpoint)
+            else:
+                self.breaker.record_success(endpoint)
+        return response
+
+    def _prepare(self, method: str, path: str,
+                 params: Union[dict, None]) -> 'PreparedRequest':
+        """Prepare a request, from a template built once for GET calls.
+
+        Headers, cookies and basic auth are the same for every call, so GET
+        calls copy a request prepared with them and only set the URL.
+        """
+        from requests import Request
+        from requests.utils import requote_uri
+
+        template = self._get_template() if method == 'GET' else None
+        if template is not None:
+            request = template.copy()
+            url = self._ENDPOINT + path
+            if params:
+                # same encoding as `requests`, which drops None values
+                query = urlencode(
+                    [(k, v) for k, v in params.items() if v is not None],
+                    doseq=True)
+                if query:
+                    url += '?' + query
+            request.url = requote_uri(url)
+            return request
+
+        return Request(method=method,
+                       url=self._ENDPOINT + path,
+                       params=params,
+                       **self._with_encoding(self.kwargs)).prepare()
+
+    def _with_encoding(self, kwargs: dict) -> dict:
+        """Add the `Accept-Encoding` header unless given."""
+        headers = kwargs.get('headers') or {}
+        if any(name.lower() == 'accept-encoding' for name in headers):
+            return kwargs
+        from .transport import accept_encoding
+        encoding = accept_encoding() if self._compression else 'identity'
+        return dict(kwargs, headers={**headers, 'Accept-Encoding': encoding})
+
+    def _get_template(self) -> Optional['PreparedRequest']:
+        # kwargs may be modified after the client is created
+        template = self._template
+        if self._template_kwargs != self.kwargs:
+            from requests import Request
+
+            # headers and cookies may be modified in place
+            kwargs = {
+                name: dict(value) if isinstance(value, Mapping) else value
+                for name, value in self.kwargs.items()
+            }
+            template = None
+            auth = kwargs.get('auth')
+            if (set(kwargs) <= _STATIC_KWARGS
+                    and (auth is None or isinstance(auth, tuple))):
+                template = Request(method='GET',
+                                   url=self._ENDPOINT,
+                                   **self._with_encoding(kwargs)).prepare()
+            self._template = template
+            self._template_kwargs = kwargs
+        return template
+
+    def _transmit(self,
+                  request: 'PreparedRequest',
+                  endpoint: str,
+                  timeout: Union[float, Tuple[float, float]],
+                  stream: bool = False) -> 'Response':
+        from requests.exceptions import RequestException
+
+        session = self._get_session()
+        start = time.monotonic()
+        try:
+            response = session.send(request,
+                                    timeout=timeout,
+                                    stream=stream)
+        except RequestException:
+            self.metrics.record_error(endpoint)
+            raise
+        self.metrics.record(endpoint, time.monotonic() - start)
+        if self.budget is not None:
+            self.budget.record(endpoint)
+        self.metrics.record_connection(
+            getattr(response, 'http_version', None),
+            getattr(response, 'new_connection', None))
+        if not stream:
+            self._record_transfer(endpoint, response, len(response.content))
+        return response
+
+    def _record_transfer(self, endpoint: str, response: 'Response',
+                         decoded: int) -> None:
+        from .transport import transfer_size
+        received = transfer_size(response)
+        if received is not None:
+            self.metrics.record_transfer(
+                endpoint, response.headers.get('Content-Encoding', 'identity'),
+                received, decoded)
+
+    def _send_hedged(self, request: 'PreparedRequest', endpoint: str,
+                     priority: str, timeout: Union[float, Tuple[float, float]]
+                     ) -> 'Response':
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from contextvars import copy_context
+
+        from requests.exceptions import RequestException
+
+        from .exceptions import DeadlineExceeded
+        delay = self.hedging.delay(self.metrics, endpoint)
+        if delay is None:
+            return self._transmit(request, endpoint, timeout)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.hedging.max_workers)
+            executor = self._executor
+        answered = threading.Event()
+        send_at = time.monotonic() + delay
+
+        def hedge() -> Optional['Response']:
+            # not sent if the call answered in the meantime
+            if answered.wait(max(send_at - time.monotonic(), 0)):
+                return None
+            self.metrics.record_hedge(endpoint)
+            if self.budget is not None:
+                self.budget.acquire(priority)
+            if self.limiter is not None:
+                self.limiter.acquire(priority)
+            return self._transmit(request.copy(), endpoint,
+                                  bound_timeout(self.timeout))
+
+        # only the duplicate uses the pool, with the deadline of the caller
+        duplicate = executor.submit(copy_context().run, hedge)
+        try:
+            response = self._transmit(request, endpoint, timeout)
+        except RequestException as e:
+            answered.set()
+            # the duplicate, if sent, may still answer
+            try:
+                other = duplicate.result(timeout=remaining())
+            except FutureTimeoutError:
+                duplicate.add_done_callback(_close_response)
+                raise DeadlineExceeded('Deadline exceeded.') from e
+            except Exception:
+                other = None
+            if other is None:
+                raise
+            return other
+        answered.set()
+        duplicate.add_done_callback(_close_response)
+        return response
+
+    def _lean_params(self, name: str) -> dict:
+        """Get a copy of the lean preset of a method if enabled."""
+        return dict(_LEAN_PARAMS[name]) if name in self.lean else {}
+
+    def _process_response(self, response: 'Response') -> Any:
+        # error payloads (e.g., 429 Too Many Requests) are not data
+        if response.status_code >= 400:
+            response.raise_for_status()
         try:
             data = response.json()
         except ValueError:
@@ -59,10 +544,20 @@ class CoinGeckoAPI:
         return data
 
     def close(self) -> None:
-        """Make sure the connection is closed."""
-        if self.session is not None:
-            self.session.close()
-            self.session = None
+        """Make sure the connection is closed.
+
+        Calls started after `close()` raise `RuntimeError`.
+        """
+        with self._lock:
+            self._closed = True
+            session = self._session or self._transport
+            self._session = self._transport = None
+            executor, self._executor = self._executor, None
+        if session is not None:
+            session.close()
+            atexit.unregister(self.close)
+        if executor is not None:
+            executor.shutdown(wait=False)
 
     #
     # ping
@@ -114,45 +609,67 @@ class CoinGeckoAPI:
     #
     # coins
     #
-    def list_coins(self) -> List[dict]:
+    def list_coins(self,
+                   params: Optional[Dict[str, Any]] = None) -> List[dict]:
         """List all supported coins (no pagination required)."""
-        return self._request('coins/list')
+
+        return self._request('coins/list', params=params)
 
     def list_coins_markets(
             self,
             vs_currency: str,
             params: Optional[Dict[str, Any]] = None) -> List[dict]:
         """List all supported coins price and market related data."""
-        _params = {'vs_currency': vs_currency}
+        _params = self._lean_params('list_coins_markets')
+        _params['vs_currency'] = vs_currency
         if params:
             _check_params(params)
             _params.update(params)
 
-        return self._request('coins/markets', params=_params)
+        return self._request('coins/markets',
+                             params=_params,
+                             fields=self.fields.get('list_coins_markets'))
 
     def get_coin(self,
                  id: str,
                  params: Optional[Dict[str, Any]] = None) -> dict:
         """Get current data for a coin."""
-        return self._request(f'coins/{id}', params=params)
+        _params = self._lean_params('get_coin')
+        if params:
+            _check_params(params)
+            _params.update(params)
+
+        return self._request(f'coins/{id}',
+                             params=_params,
+                             fields=self.fields.get('get_coin'))
 
     def get_coin_tickers(self,
                          id: str,
                          params: Optional[Dict[str, Any]] = None) -> dict:
         """Get coin tickers (paginated to 100 items)."""
-        return self._request(f'coins/{id}/tickers', params=params)
+        _params = self._lean_params('get_coin_tickers')
+        if params:
+            _check_params(params)
+            _params.update(params)
+
+        return self._request(f'coins/{id}/tickers',
+                             params=_params,
+                             fields=self.fields.get('get_coin_tickers'))
 
     def get_coin_history(self,
                          id: str,
                          date: str,
                          params: Optional[Dict[str, Any]] = None) -> dict:
         """Get historical data at a given date for a coin."""
-        _params = {'date': date}
+        _params = self._lean_params('get_coin_history')
+        _params['date'] = date
         if params:
             _check_params(params)
             _params.update(params)
 
-        return self._request(f'coins/{id}/history', params=_params)
+        return self._request(f'coins/{id}/history',
+                             params=_params,
+                             fields=self.fields.get('get_coin_history'))
 
     def get_coin_market_chart(self,
                               id: str,
@@ -211,7 +728,8 @@ class CoinGeckoAPI:
                        params: Optional[Dict[str, Any]] = None) -> dict:
         """Get coin info from contract address."""
         return self._request(f'coins/{id}/contract/{contract_address}',
-                             params=params)
+                             params=params,
+                             fields=self.fields.get('get_token_info'))
 
     def get_token_market_chart(
             self,
@@ -292,14 +810,21 @@ class CoinGeckoAPI:
 
     def get_exchange_volume(self, id: str) -> dict:
         """Get exchange volume in BTC and top 100 tickers only"""
-        return self._request(f'exchanges/{id}')
+        return self._request(f'exchanges/{id}',
+                             fields=self.fields.get('get_exchange_volume'))
 
     def get_exchange_tickers(self,
                              id: str,
                              params: Optional[Dict[str, Any]] = None) -> dict:
         """Get exchange tickers (paginated)."""
+        _params = self._lean_params('get_exchange_tickers')
+        if params:
+            _check_params(params)
+            _params.update(params)
 
-        return self._request(f'exchanges/{id}/tickers', params=params)
+        return self._request(f'exchanges/{id}/tickers',
+                             params=_params,
+                             fields=self.fields.get('get_exchange_tickers'))
 
     def get_exchange_volume_chart(self, id: str, days: int) -> List[list]:
         """Get volume_chart data for a given exchange."""
@@ -349,7 +874,10 @@ class CoinGeckoAPI:
                                       ) -> dict:
         """Get derivative exchange data (able to include tickers)."""
 
-        return self._request(f'derivatives/exchanges/{id}', params=params)
+        return self._request(
+            f'derivatives/exchanges/{id}',
+            params=params,
+            fields=self.fields.get('get_derivatives_exchange_info'))
 
     def list_derivatives_exchanges(self) -> List[dict]:
         return self._request('derivatives/exchanges/list')
@@ -0,0 +1,62 @@
+import argparse
+from typing import List, Optional
+
+from . import CoinGeckoAPI
+from .crawl import STAGES, Crawler
+from .ratelimit import RateLimiter
+
+
+def _crawl(args: argparse.Namespace) -> None:
+    stages = args.stages.split(',') if args.stages else STAGES
+    headers = {'x-cg-pro-api-key': args.api_key} if args.api_key else None
+    cg = CoinGeckoAPI(timeout=args.timeout,
+                      limiter=RateLimiter(args.rate),
+                      headers=headers)
+    if args.api_key:
+        cg._ENDPOINT = 'https://pro-api.coingecko.com/api/v3/'
+    try:
+        Crawler(cg,
+                args.output,
+                checkpoint=args.checkpoint,
+                format=args.format,
+                vs_currency=args.vs_currency,
+                workers=args.workers,
+                retries=args.retries,
+                progress=not args.quiet).run(stages)
+    finally:
+        cg.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m coingecko_api')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl = commands.add_parser(
+        'crawl', help='snapshot markets, coins and exchange tickers')
+    crawl.add_argument('output', help='output directory')
+    crawl.add_argument('--checkpoint',
+                       help='checkpoint file (default: OUTPUT/checkpoint.json)')
+    crawl.add_argument('--stages',
+                       help=f'comma separated stages (default: '
+                       f'{",".join(STAGES)})')
+    crawl.add_argument('--format', choices=('jsonl', 'parquet'),
+                       default='jsonl')
+    crawl.add_argument('--vs-currency', default='usd')
+    crawl.add_argument('--rate',
+                       type=int,
+                       default=30,
+                       help='calls per minute allowed by the plan')
+    crawl.add_argument('--workers', type=int, default=1)
+    crawl.add_argument('--retries', type=int, default=5)
+    crawl.add_argument('--timeout', type=int, default=30)
+    crawl.add_argument('--api-key', help='CoinGecko Pro API key')
+    crawl.add_argument('--quiet', action='store_true',
+                       help='do not display the progress')
+    crawl.set_defaults(func=_crawl)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
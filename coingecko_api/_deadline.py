@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound the total time of the calls made in the block.
+
+    Every call, retry and wait of the rate limiter in the block shares the
+    remaining time, and `DeadlineExceeded` is raised once it has passed.
+    Nested deadlines cannot extend an outer one.
+
+    Example:
+        >>> with deadline(2):
+        ...     cg.get_simple_price(ids, 'usd')
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(at if outer is None else min(at, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Get the seconds left before the deadline, None without deadline."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check() -> None:
+    """Raise `DeadlineExceeded` if the deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        from .exceptions import DeadlineExceeded
+        raise DeadlineExceeded('Deadline exceeded.')
+
+
+def bound_wait(delay: Optional[float]) -> Optional[float]:
+    """Cap the seconds of a wait to the deadline.
+
+    Args:
+        delay (float): Seconds to wait, None to wait until notified.
+
+    Raises:
+        DeadlineExceeded: The deadline has passed or comes before `delay`.
+    """
+    left = remaining()
+    if left is None:
+        return delay
+    if left <= 0 or (delay is not None and delay > left):
+        from .exceptions import DeadlineExceeded
+        raise DeadlineExceeded('Deadline exceeded.')
+    return left if delay is None else delay
+
+
+def bound_timeout(
+    timeout: Union[float, Tuple[float, float], None]
+) -> Union[float, Tuple[float, float], None]:
+    """Cap a `(connect, read)` or single timeout to the deadline."""
+    check()
+    left = remaining()
+    if left is None:
+        return timeout
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return min(timeout[0], left), min(timeout[1], left)
+    return min(timeout, left)
@@ -0,0 +1,20 @@
+import sqlite3
+
+
+def connect(path: str, timeout: float) -> sqlite3.Connection:
+    """Open a SQLite database shared by the threads and processes of a host.
+
+    The connection is in autocommit mode, so transactions are explicit, and
+    uses a WAL journal so that readers do not block the writer. Callers
+    serialize their use of the connection with their own lock.
+
+    Args:
+        path (str): Location of the database file.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+    conn = sqlite3.connect(path,
+                           timeout=timeout,
+                           isolation_level=None,
+                           check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
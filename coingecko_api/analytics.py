@@ -0,0 +1,303 @@
+"""Vectorized analytics over market chart data.
+
+Works on the columnar arrays of `get_coin_market_chart`,
+`get_coin_market_chart_range` and their token counterparts. Functions taking
+`values` accept a 1-D array of one series or a 2-D array of many series
+(one per row, padded with NaN, see `stack`), so that thousands of coins are
+processed in one call.
+
+Requires NumPy, e.g., `pip install numpy`.
+"""
+import re
+from typing import (TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional,
+                    Sequence, Tuple, Union)
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError('coingecko_api.analytics requires NumPy, '
+                      'e.g., pip install numpy') from e
+
+from .crawl import imap_unordered
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+_UNITS = {'s': 1000, 'm': 60_000, 'h': 3_600_000, 'd': 86_400_000}
+_INTERVAL = re.compile(r'^(\d+)([smhd])$')
+_HOW = ('first', 'last', 'min', 'max', 'sum', 'mean')
+
+
+def interval_ms(interval: Union[int, str]) -> int:
+    """Get an interval in milliseconds from e.g. `5m`, `1h` or `1d`."""
+    if isinstance(interval, str):
+        match = _INTERVAL.match(interval)
+        if match is None:
+            raise ValueError(f'Invalid interval: {interval}')
+        interval = int(match.group(1)) * _UNITS[match.group(2)]
+    if interval <= 0:
+        raise ValueError('interval should be positive.')
+    return int(interval)
+
+
+def columns(chart: dict, key: str = 'prices') -> Tuple[np.ndarray, np.ndarray]:
+    """Get the timestamps (ms, int64) and values (float64) of a chart.
+
+    Args:
+        chart (dict): Response of a market chart method.
+        key (str): `prices`, `market_caps` or `total_volumes`.
+    """
+    data = np.asarray(chart[key], dtype=np.float64).reshape(-1, 2)
+    return data[:, 0].astype(np.int64), data[:, 1]
+
+
+def stack(series: Sequence[np.ndarray]) -> np.ndarray:
+    """Stack series of different lengths in rows padded with NaN."""
+    width = max((len(s) for s in series), default=0)
+    out = np.full((len(series), width), np.nan)
+    for row, s in zip(out, series):
+        row[:len(s)] = s
+    return out
+
+
+def _bins(timestamps: np.ndarray,
+          interval: Union[int, str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Start timestamps of the bars and indices of their first tick."""
+    step = interval_ms(interval)
+    bins = np.asarray(timestamps, dtype=np.int64) // step
+    if len(bins) and np.any(np.diff(bins) < 0):
+        raise ValueError('timestamps should be sorted.')
+    starts = np.flatnonzero(np.diff(bins, prepend=bins[:1] - 1))
+    return bins[starts] * step, starts
+
+
+def _aggregate(values: np.ndarray, starts: np.ndarray, how: str) -> np.ndarray:
+    """Aggregate the ticks of every bar along the last axis."""
+    if how == 'first':
+        return values[..., starts]
+    if how == 'last':
+        ends = np.append(starts[1:], values.shape[-1]) - 1
+        return values[..., ends]
+    if how == 'min':
+        return np.minimum.reduceat(values, starts, axis=-1)
+    if how == 'max':
+        return np.maximum.reduceat(values, starts, axis=-1)
+    sums = np.add.reduceat(values, starts, axis=-1)
+    if how == 'sum':
+        return sums
+    if how == 'mean':
+        return sums / np.diff(np.append(starts, values.shape[-1]))
+    raise ValueError(f'how should be one of {_HOW}.')
+
+
+def resample(timestamps: np.ndarray,
+             values: np.ndarray,
+             interval: Union[int, str],
+             how: str = 'last') -> Tuple[np.ndarray, np.ndarray]:
+    """Resample a series to bars of a fixed interval.
+
+    Bars without ticks are left out.
+
+    Args:
+        timestamps (ndarray): Sorted timestamps in milliseconds.
+        values (ndarray): Values of the ticks, 1-D or one series per row.
+        interval (int or str): Milliseconds or e.g. `15m`, `4h`, `1d`.
+        how (str): `first`, `last`, `min`, `max`, `sum` or `mean`.
+
+    Returns:
+        tuple: Start timestamps and values of the bars, one row per series
+        for 2-D `values`.
+    """
+    if how not in _HOW:
+        raise ValueError(f'how should be one of {_HOW}.')
+    values = np.asarray(values, dtype=np.float64)
+    if not len(timestamps):
+        return np.empty(0, dtype=np.int64), np.empty(values.shape[:-1] + (0, ))
+    bars, starts = _bins(timestamps, interval)
+    return bars, _aggregate(values, starts, how)
+
+
+def ohlc(timestamps: np.ndarray,
+         prices: np.ndarray,
+         interval: Union[int, str],
+         volumes: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Build OHLC bars from the ticks of a chart.
+
+    `total_volumes` of the charts are rolling 24h volumes, so the volume of a
+    bar is the last one of its ticks.
+
+    Returns:
+        dict: Arrays `timestamp`, `open`, `high`, `low`, `close` and
+        `volume` if `volumes` is given.
+    """
+    if not len(timestamps):
+        empty = np.empty(0)
+        bars = {
+            'timestamp': np.empty(0, dtype=np.int64),
+            'open': empty,
+            'high': empty,
+            'low': empty,
+            'close': empty
+        }
+        if volumes is not None:
+            bars['volume'] = empty
+        return bars
+
+    bars, starts = _bins(timestamps, interval)
+    prices = np.asarray(prices, dtype=np.float64)
+    result = {
+        'timestamp': bars,
+        'open': _aggregate(prices, starts, 'first'),
+        'high': _aggregate(prices, starts, 'max'),
+        'low': _aggregate(prices, starts, 'min'),
+        'close': _aggregate(prices, starts, 'last')
+    }
+    if volumes is not None:
+        result['volume'] = _aggregate(np.asarray(volumes, dtype=np.float64),
+                                      starts, 'last')
+    return result
+
+
+def log_returns(values: np.ndarray) -> np.ndarray:
+    """Get the log returns along the last axis (one shorter)."""
+    return np.diff(np.log(np.asarray(values, dtype=np.float64)), axis=-1)
+
+
+def simple_returns(values: np.ndarray) -> np.ndarray:
+    """Get the simple returns along the last axis (one shorter)."""
+    values = np.asarray(values, dtype=np.float64)
+    return values[..., 1:] / values[..., :-1] - 1
+
+
+def rolling_volatility(returns: np.ndarray, window: int) -> np.ndarray:
+    """Get the rolling standard deviation of returns along the last axis.
+
+    The first `window - 1` values are NaN. Windows containing NaN are NaN.
+    """
+    if window < 2:
+        raise ValueError('window should be at least 2.')
+    returns = np.asarray(returns, dtype=np.float64)
+    out = np.full(returns.shape, np.nan)
+    n = returns.shape[-1]
+    if n < window:
+        return out
+
+    # O(n) moving sums of the values, their squares and the NaN count, so
+    # that a NaN only affects the windows containing it
+    missing = np.isnan(returns)
+    values = np.where(missing, 0.0, returns)
+    zero = np.zeros(returns.shape[:-1] + (1, ))
+
+    def moving_sum(x: np.ndarray) -> np.ndarray:
+        sums = np.concatenate([zero, np.cumsum(x, axis=-1)], axis=-1)
+        return sums[..., window:] - sums[..., :-window]
+
+    total = moving_sum(values)
+    total_sq = moving_sum(values**2)
+    var = (total_sq - total**2 / window) / (window - 1)
+    out[..., window - 1:] = np.where(
+        moving_sum(missing) > 0, np.nan, np.sqrt(np.maximum(var, 0)))
+    return out
+
+
+def vwap(prices: np.ndarray,
+         volumes: np.ndarray,
+         axis: int = -1) -> Union[float, np.ndarray]:
+    """Get the volume-weighted average price, ignoring NaN ticks."""
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    valid = ~(np.isnan(prices) | np.isnan(volumes))
+    weights = np.where(valid, volumes, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (np.where(valid, prices, 0) * weights).sum(axis=axis) / \
+            weights.sum(axis=axis)
+
+
+class PriceMatrix(NamedTuple):
+    """Series of many coins aligned on a common time grid.
+
+    Attributes:
+        timestamps (ndarray): Start of the bars in milliseconds, shape (T, ).
+        values (ndarray): Values, shape (T, N) with one column per coin.
+        observed (ndarray): Whether a bar had ticks, shape (T, N).
+        ids (list): Coin ids of the columns.
+    """
+    timestamps: np.ndarray
+    values: np.ndarray
+    observed: np.ndarray
+    ids: List[str]
+
+
+def align(charts: Sequence[dict],
+          start_ms: int,
+          end_ms: int,
+          interval: Union[int, str] = '1h',
+          key: str = 'prices',
+          ffill: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Align the last value per bar of many charts on a common grid.
+
+    Args:
+        charts (list): Responses of a market chart method.
+        start_ms (int): Start of the grid in milliseconds.
+        end_ms (int): End of the grid in milliseconds (included).
+        interval (int or str): Milliseconds or e.g. `5m`, `1h`, `1d`.
+        key (str): `prices`, `market_caps` or `total_volumes`.
+        ffill (bool): Fill bars without ticks with the previous value,
+            otherwise they are NaN.
+
+    Returns:
+        tuple: Timestamps (T, ), values (T, N) and observed mask (T, N).
+    """
+    step = interval_ms(interval)
+    grid = np.arange(start_ms // step * step, end_ms + 1, step)
+    values = np.full((len(grid), len(charts)), np.nan)
+    observed = np.zeros(values.shape, dtype=bool)
+    for col, chart in enumerate(charts):
+        timestamps, ticks = columns(chart, key)
+        if not len(timestamps):
+            continue
+        bars, last = resample(timestamps, ticks, step)
+        rows = (bars - grid[0]) // step
+        inside = (rows >= 0) & (rows < len(grid))
+        values[rows[inside], col] = last[inside]
+        observed[rows[inside], col] = True
+
+    if ffill and len(grid):
+        # index of the last observed row, per column
+        rows = np.where(observed, np.arange(len(grid))[:, None], 0)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        values = values[rows, np.arange(len(charts))]
+    return grid, values, observed
+
+
+def price_matrix(cg: 'CoinGeckoAPI',
+                 ids: Sequence[str],
+                 vs_currency: str,
+                 from_unix_ts: int,
+                 to_unix_ts: int,
+                 interval: Union[int, str] = '1h',
+                 key: str = 'prices',
+                 ffill: bool = True,
+                 workers: int = 8,
+                 params: Optional[Dict[str, Any]] = None) -> PriceMatrix:
+    """Fetch the charts of many coins and align them (time x coin).
+
+    The charts are fetched concurrently with `get_coin_market_chart_range`
+    under the rate limiter, deadline and priority of the caller.
+
+    Example:
+        >>> m = price_matrix(cg, ['bitcoin', 'ethereum'], 'usd', start, end)
+        >>> np.corrcoef(log_returns(m.values.T))
+    """
+    ids = list(ids)
+
+    def fetch(id: str) -> dict:
+        return cg.get_coin_market_chart_range(id, vs_currency, from_unix_ts,
+                                              to_unix_ts, params)
+
+    fetched = dict(imap_unordered(fetch, ids, workers))
+    charts = [fetched[id] for id in ids]
+
+    grid, values, observed = align(charts, from_unix_ts * 1000,
+                                   to_unix_ts * 1000, interval, key, ffill)
+    return PriceMatrix(grid, values, observed, ids)
@@ -0,0 +1,199 @@
+"""Date-range backfill of `get_coin_history` across many coins.
+
+Daily snapshots are kept in a SQLite `HistoryStore` keyed by coin id and day,
+so a backfill only calls the days missing from the store and an interrupted
+backfill resumes where it stopped.
+
+Example:
+    >>> backfill = Backfill(cg, 'history.db', workers=8)
+    >>> for id, day, data in backfill.run(ids, date(2021, 1, 1),
+    ...                                   date(2021, 12, 31)):
+    ...     print(id, day, data['market_data']['market_cap']['usd'])
+"""
+import datetime
+import json
+import sys
+import threading
+import time
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Set,
+                    Tuple, Union)
+
+from requests.exceptions import RequestException
+
+from . import CoinGeckoAPI
+from ._sqlite import connect
+from .crawl import Progress, call_with_retry, imap_unordered
+from .ratelimit import BULK, priority
+from .resilience import CircuitOpenError
+
+DATE_FORMAT = '%d-%m-%Y'
+
+Day = Union[datetime.date, str]
+
+
+def _as_date(day: Day) -> datetime.date:
+    if isinstance(day, str):
+        return datetime.datetime.strptime(day, DATE_FORMAT).date()
+    return day
+
+
+def date_range(start: Day, end: Day) -> List[datetime.date]:
+    """Get the days from `start` to `end` (included).
+
+    Args:
+        start (date or str): First day, as a `date` or `dd-mm-yyyy`.
+        end (date or str): Last day, as a `date` or `dd-mm-yyyy`.
+    """
+    start, end = _as_date(start), _as_date(end)
+    return [
+        start + datetime.timedelta(days=n)
+        for n in range((end - start).days + 1)
+    ]
+
+
+class HistoryStore:
+    """SQLite store of `get_coin_history` responses by coin id and day.
+
+    Args:
+        path (str): Location of the database file.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, timeout)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS history '
+                           '(id TEXT, date TEXT, fetched_at REAL, data TEXT, '
+                           'PRIMARY KEY (id, date))')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM history').fetchone()[0]
+
+    def dates(self, id: str) -> Set[datetime.date]:
+        """Get the days stored for a coin."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT date FROM history WHERE id = ?', (id, )).fetchall()
+        return {datetime.date.fromisoformat(row[0]) for row in rows}
+
+    def count(self, id: str, start: Day, end: Day) -> int:
+        """Count the days stored for a coin from `start` to `end`."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM history WHERE id = ? '
+                'AND date BETWEEN ? AND ?',
+                (id, _as_date(start).isoformat(),
+                 _as_date(end).isoformat())).fetchone()[0]
+
+    def get(self, id: str, day: Day) -> Optional[dict]:
+        """Get the response of a coin at a day, None if missing."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM history WHERE id = ? AND date = ?',
+                (id, _as_date(day).isoformat())).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, id: str, day: Day, data: Any) -> None:
+        text = json.dumps(data, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?)',
+                (id, _as_date(day).isoformat(), time.time(), text))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Backfill:
+    """Fetch `get_coin_history` for every coin and day of a date range.
+
+    Days already in the store are skipped. The other ones are fetched
+    concurrently under the rate limiter of `cg`, in the `bulk` priority class
+    by default, and failed calls are retried with `call_with_retry`.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        store (HistoryStore or str): Store, or location of its database file.
+        workers (int): Number of concurrent calls.
+        retries (int): Number of retries of a failed call.
+        params (dict): Additional parameters of `get_coin_history`, e.g.,
+            `{'localization': 'false'}`.
+        priority (str): Priority class of the calls.
+        progress (bool): Whether to display the progress on stderr.
+
+    Attributes:
+        errors (dict): Exception per `(id, day)` failed in the last run.
+        progress (Progress): Progress of the last run, e.g., its `eta`.
+    """
+
+    def __init__(self,
+                 cg: CoinGeckoAPI,
+                 store: Union[HistoryStore, str],
+                 workers: int = 4,
+                 retries: int = 5,
+                 params: Optional[Dict[str, Any]] = None,
+                 priority: str = BULK,
+                 progress: bool = True) -> None:
+        self.cg = cg
+        self.store = HistoryStore(store) if isinstance(store, str) else store
+        self.workers = workers
+        self.retries = retries
+        self.params = params
+        self.priority = priority
+        self.errors: Dict[Tuple[str, datetime.date], Exception] = {}
+        self.progress: Optional[Progress] = None
+        self._show_progress = progress
+
+    def missing(self, ids: Iterable[str], start: Day,
+                end: Day) -> Iterator[Tuple[str, datetime.date]]:
+        """Yield the `(id, day)` pairs of the range missing from the store.
+
+        The stored days of a coin are only read once its pairs are reached.
+        """
+        days = date_range(start, end)
+        for id in ids:
+            stored = self.store.dates(id)
+            yield from ((id, day) for day in days if day not in stored)
+
+    def _fetch(self, task: Tuple[str, datetime.date]) -> Any:
+        id, day = task
+        try:
+            with priority(self.priority):
+                return call_with_retry(self.cg.get_coin_history,
+                                       id,
+                                       day.strftime(DATE_FORMAT),
+                                       self.params,
+                                       retries=self.retries)
+        except (RequestException, CircuitOpenError) as e:
+            return e
+
+    def run(self, ids: Iterable[str], start: Day,
+            end: Day) -> Iterator[Tuple[str, datetime.date, dict]]:
+        """Fetch the missing days, yielding `(id, day, data)` as they are
+        stored.
+
+        Calls failed after all retries are left out and kept in `errors`, so
+        that running the backfill again retries them.
+        """
+        ids = list(ids)
+        days = len(date_range(start, end))
+        done = sum(self.store.count(id, start, end) for id in ids)
+        self.errors = {}
+        self.progress = Progress('history',
+                                 total=len(ids) * days,
+                                 done=done,
+                                 stream=sys.stderr
+                                 if self._show_progress else None)
+        tasks = self.missing(ids, start, end)
+        for task, data in imap_unordered(self._fetch, tasks, self.workers):
+            if isinstance(data, Exception):
+                self.errors[task] = data
+            else:
+                self.store.put(task[0], task[1], data)
+                yield task[0], task[1], data
+            self.progress.update()
+        self.progress.close()
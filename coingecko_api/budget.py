@@ -0,0 +1,195 @@
+"""Monthly credit budget of an API key.
+
+Paid plans come with a number of credits (calls) per calendar month.
+`CreditBudget` counts the credits used per endpoint in a SQLite database
+shared by the processes using the key, projects the usage of the month at
+the current rate and paces the low priority calls, so that the budget lasts
+until the end of the month while interactive calls keep full speed.
+"""
+import datetime
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from ._deadline import remaining
+from ._sqlite import connect
+from .exceptions import DeadlineExceeded
+from .ratelimit import BULK, DEFAULT, PRIORITIES
+
+
+class BudgetExhausted(RuntimeError):
+    """Raised for a throttled call once the share of the month is spent."""
+
+
+def month_of(timestamp: float) -> Tuple[str, float, float]:
+    """Get the name (`2022-05`), start and end timestamps of the calendar
+    month (UTC) of a timestamp."""
+    day = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    start = day.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start.strftime('%Y-%m'), start.timestamp(), end.timestamp()
+
+
+class CreditBudget:
+    """Credits used by an API key, persisted per month and endpoint.
+
+    Throttled priority classes follow a linear schedule of `1 - reserve` of
+    the credits over the month, `burst` credits ahead at most: a call ahead
+    of the schedule waits until it catches up, so their rate drops to what
+    the remaining budget can sustain. Once their share of the month is
+    spent, their calls raise `BudgetExhausted`. The reserve is left to the
+    other classes.
+
+    Args:
+        path (str): Location of the database file.
+        credits (int): Credits per month.
+        key (str): Name of the API key, the budget of each key is separate.
+        costs (dict): Credits per endpoint (e.g., `coins/{}/history`) when
+            not 1.
+        throttled (list): Priority classes paced by the budget.
+        reserve (float): Fraction of the credits not available to the
+            throttled classes.
+        burst (int): Credits the throttled classes may use ahead of the
+            schedule.
+        timeout (float): Seconds to wait for a lock held by another process.
+
+    Example:
+        >>> budget = CreditBudget('credits.db', 500_000, key='prod')
+        >>> cg = CoinGeckoAPI(budget=budget)
+        >>> budget.status()['projected']
+    """
+
+    def __init__(self,
+                 path: str,
+                 credits: int,
+                 key: str = 'default',
+                 costs: Optional[Dict[str, int]] = None,
+                 throttled: Iterable[str] = (DEFAULT, BULK),
+                 reserve: float = 0.1,
+                 burst: int = 100,
+                 timeout: float = 30.0) -> None:
+        if credits <= 0:
+            raise ValueError('credits should be positive.')
+        if not 0 <= reserve < 1:
+            raise ValueError('reserve should be in [0, 1).')
+
+        self.path = path
+        self.credits = credits
+        self.key = key
+        self.costs = costs or {}
+        self.throttled = set(throttled)
+        self.reserve = reserve
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._conn = connect(path, timeout)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS credits '
+                           '(key TEXT, month TEXT, endpoint TEXT, '
+                           'used INTEGER, PRIMARY KEY (key, month, endpoint))')
+
+    def record(self, endpoint: str, now: Optional[float] = None) -> None:
+        """Count the credits of a call to an endpoint."""
+        month = month_of(time.time() if now is None else now)[0]
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO credits VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (key, month, endpoint) '
+                'DO UPDATE SET used = used + excluded.used',
+                (self.key, month, endpoint, self.costs.get(endpoint, 1)))
+
+    def usage(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Get the credits used per endpoint this month."""
+        month = month_of(time.time() if now is None else now)[0]
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT endpoint, used FROM credits '
+                'WHERE key = ? AND month = ?', (self.key, month)).fetchall()
+        return dict(rows)
+
+    def used(self, now: Optional[float] = None) -> int:
+        """Get the credits used this month."""
+        return sum(self.usage(now).values())
+
+    def projected(self, now: Optional[float] = None) -> float:
+        """Project the credits used at the end of the month at the rate of
+        the month so far."""
+        return self.status(now)['projected']
+
+    def status(self, now: Optional[float] = None) -> dict:
+        """Get the credits, used, remaining and projected credits of the
+        month."""
+        now = time.time() if now is None else now
+        used = self.used(now)
+        month, start, end = month_of(now)
+        return {
+            'key': self.key,
+            'month': month,
+            'credits': self.credits,
+            'used': used,
+            'remaining': self.credits - used,
+            'projected': used * (end - start) / max(now - start, 1.0)
+        }
+
+    def delay(self,
+              priority: Optional[str],
+              now: Optional[float] = None) -> float:
+        """Get the seconds a call should wait to stay on the schedule.
+
+        Returns:
+            float: Seconds until the end of the month once the share of the
+            throttled classes is spent.
+        """
+        now = time.time() if now is None else now
+        delay = self._delay(priority, now)
+        return month_of(now)[2] - now if delay is None else delay
+
+    def _delay(self, priority: Optional[str], now: float) -> Optional[float]:
+        """Seconds a call should wait, None if the share is spent."""
+        if (priority or DEFAULT) not in self.throttled:
+            return 0.0
+        _, start, end = month_of(now)
+        used = self.used(now)
+        share = self.credits * (1 - self.reserve)
+        if used + 1 > share:
+            return None
+        rate = share / (end - start)
+        ahead = used + 1 - self.burst - rate * (now - start)
+        return max(ahead / rate, 0.0)
+
+    def acquire(self,
+                priority: Optional[str] = None,
+                poll: float = 5.0) -> float:
+        """Block until a call of a priority class is on the schedule.
+
+        The budget is checked again every `poll` seconds, as other processes
+        may use the same key.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            BudgetExhausted: If the share of the month is spent.
+            DeadlineExceeded: If the wait goes past the current `deadline()`.
+        """
+        waited = 0.0
+        while True:
+            delay = self._delay(priority, time.time())
+            if delay is None:
+                raise BudgetExhausted(
+                    f'Credit budget of {self.key} is spent for the month, '
+                    f'only {sorted(set(PRIORITIES) - self.throttled)} calls '
+                    'are allowed.')
+            if not delay:
+                return waited
+            left = remaining()
+            if left is not None and left <= delay:
+                raise DeadlineExceeded(
+                    'Deadline exceeded waiting for the credit budget.')
+            time.sleep(min(delay, poll))
+            waited += min(delay, poll)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from ._sqlite import connect
+
+
+class OfflineError(RuntimeError):
+    """Raised by an offline client for a call missing from its cache."""
+
+
+class MemoryCache:
+    """Least recently used cache of responses in the current process.
+
+    Entries are returned with the time they were stored, the client decides
+    whether they are fresh enough. Values are stored as JSON, so every
+    caller gets its own copy and may modify it.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Get `(stored_at, value)` of an entry, None if missing."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+        return entry[0], json.loads(entry[1])
+
+    def set(self, key: str, value: Any) -> None:
+        text = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            self._data[key] = (time.time(), text)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache:
+    """Cache of responses shared by the processes of a host.
+
+    Values are stored as JSON in a SQLite database, so that a response fetched
+    by one worker serves all of them.
+
+    Args:
+        path (str): Location of the database file.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, timeout)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS cache '
+                           '(key TEXT PRIMARY KEY, stored_at REAL, value TEXT)')
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Get `(stored_at, value)` of an entry, None if missing."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT stored_at, value FROM cache WHERE key = ?',
+                (key, )).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, value: Any) -> None:
+        text = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?)',
+                (key, time.time(), text))
+
+    def purge(self, max_age: float) -> int:
+        """Remove entries older than `max_age` seconds.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM cache WHERE stored_at < ?',
+                (time.time() - max_age, ))
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,143 @@
+"""Record and replay the calls of a client, e.g., for offline load tests.
+
+A cassette is a gzip-compressed JSON lines file with one exchange per line:
+the method and URL of the request, the status, headers and body of the
+response, and the seconds it took.
+
+Example:
+    >>> cg = CoinGeckoAPI(transport=RecordingSession('calls.jsonl.gz'))
+    >>> cg.get_coin('bitcoin')
+    >>> cg.close()
+    >>> cg = CoinGeckoAPI(transport=ReplaySession('calls.jsonl.gz'))
+    >>> cg.get_coin('bitcoin')  # no network, after the recorded latency
+"""
+import base64
+import datetime
+import gzip
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response, Session
+from requests import exceptions as rexc
+
+from .transport import build_response, create_session
+
+# the body is recorded decoded
+_DROPPED_HEADERS = {'content-encoding', 'transfer-encoding'}
+
+
+def _match_key(method: str, url: str) -> Tuple[str, str]:
+    """Key of a request regardless of the order of its query parameters."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return method, urlunsplit(parts._replace(query=query))
+
+
+def _read_timeout(timeout: Union[float, Tuple[float, float], None]):
+    return timeout[1] if isinstance(timeout, tuple) else timeout
+
+
+class RecordingSession:
+    """Send the requests on a session and record them to a cassette.
+
+    Args:
+        path (str): Location of the cassette, appended to if it exists.
+        session (Session): Session sending the requests, a new
+            `requests.Session` by default.
+    """
+
+    def __init__(self, path: str, session: Optional[Session] = None) -> None:
+        self.path = path
+        self.session = session if session is not None else create_session()
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        start = time.monotonic()
+        response = self.session.send(request, **kwargs)
+        record = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in _DROPPED_HEADERS
+            },
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': time.monotonic() - start
+        }
+        with self._lock:
+            self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.session.close()
+
+
+class ReplaySession:
+    """Serve the responses of a cassette without network.
+
+    Requests are matched by method and URL, regardless of the order of the
+    query parameters. A request recorded several times gets its responses
+    in order, then from the start again.
+
+    Args:
+        path (str): Location of the cassette.
+        speed (float): Scale of the recorded latencies, e.g., 0 to reply
+            immediately or 2 to reply twice slower. A reply slower than the
+            read timeout of the call raises `ReadTimeout`.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        if speed < 0:
+            raise ValueError('speed should not be negative.')
+        self.path = path
+        self.speed = speed
+        self.records: Dict[Tuple[str, str], List[dict]] = {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                key = _match_key(record['method'], record['url'])
+                self.records.setdefault(key, []).append(record)
+        self._next: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def send(self,
+             request: PreparedRequest,
+             timeout: Union[float, Tuple[float, float], None] = None,
+             **kwargs) -> Response:
+        key = _match_key(request.method, request.url)
+        with self._lock:
+            records = self.records.get(key)
+            if not records:
+                raise rexc.ConnectionError(
+                    f'No recorded response for {request.method} '
+                    f'{request.url}',
+                    request=request)
+            n = self._next.get(key, 0)
+            self._next[key] = (n + 1) % len(records)
+        record = records[n]
+
+        latency = record['elapsed'] * self.speed
+        read_timeout = _read_timeout(timeout)
+        if read_timeout is not None and latency > read_timeout:
+            time.sleep(read_timeout)
+            raise rexc.ReadTimeout(f'Replayed latency {latency:.3f}s',
+                                   request=request)
+        time.sleep(latency)
+        return build_response(request, record['status'],
+                              record['headers'].items(),
+                              base64.b64decode(record['body']),
+                              record['reason'],
+                              datetime.timedelta(seconds=latency))
+
+    def close(self) -> None:
+        pass
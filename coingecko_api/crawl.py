@@ -0,0 +1,491 @@
+"""Resumable crawl of the whole CoinGecko universe.
+
+The crawl is split into stages, each made of independent tasks:
+
+- `markets`: every page of `coins/markets`
+- `coins`: `get_coin` for every id of `list_coins`
+- `tickers`: every page of `get_exchange_tickers` for every exchange
+
+Progress is committed to a checkpoint file together with the position of the
+output files, so an interrupted crawl resumes where it stopped without
+duplicated records.
+"""
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    TextIO, Tuple)
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from . import CoinGeckoAPI
+from ._deadline import remaining
+from .exceptions import DeadlineExceeded
+
+STAGES = ('markets', 'coins', 'tickers')
+MARKETS_PER_PAGE = 250
+TICKERS_PER_PAGE = 100
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration as `1h02m03s`."""
+    if seconds != seconds or seconds == float('inf'):
+        return '--'
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f'{hours}h{minutes:02d}m{secs:02d}s'
+    if minutes:
+        return f'{minutes}m{secs:02d}s'
+    return f'{secs}s'
+
+
+class Progress:
+    """Throughput and ETA display of a long running job.
+
+    Args:
+        label (str): Name of the job.
+        total (int): Number of tasks.
+        done (int): Number of tasks already completed, e.g., when resuming.
+        stream (TextIO): Where to write the display, e.g., `sys.stderr`.
+            Nothing is displayed if None.
+        interval (float): Minimum seconds between two refreshes.
+    """
+
+    def __init__(self,
+                 label: str,
+                 total: int,
+                 done: int = 0,
+                 stream: Optional[TextIO] = None,
+                 interval: float = 1.0) -> None:
+        self.label = label
+        self.total = total
+        self.done = done
+        self.stream = stream
+        self.interval = interval
+        self._initial = done
+        self._started = time.monotonic()
+        self._rendered = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Tasks completed per second in this run."""
+        elapsed = time.monotonic() - self._started
+        return (self.done - self._initial) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Projected seconds until completion."""
+        rate = self.rate
+        remaining = max(self.total - self.done, 0)
+        if not remaining:
+            return 0.0
+        return remaining / rate if rate > 0 else float('inf')
+
+    def render(self) -> str:
+        pct = 100 * self.done / self.total if self.total else 100.0
+        return (f'{self.label}: {self.done}/{self.total} ({pct:.1f}%) '
+                f'{self.rate:.2f}/s ETA {format_seconds(self.eta)}')
+
+    def update(self, n: int = 1) -> None:
+        self.done += n
+        now = time.monotonic()
+        if now - self._rendered >= self.interval:
+            self._rendered = now
+            self._write('\r' + self.render())
+
+    def close(self) -> None:
+        self._write('\r' + self.render() + '\n')
+
+    def _write(self, text: str) -> None:
+        if self.stream is not None:
+            self.stream.write(text)
+            self.stream.flush()
+
+
+class Checkpoint:
+    """Crawl progress persisted to a JSON file.
+
+    The file is replaced atomically so that a crash never leaves it half
+    written.
+
+    Args:
+        path (str): Location of the checkpoint file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.state: Dict[str, Any] = {'stages': {}}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def stage(self, name: str) -> dict:
+        """Get the state of a stage: done tasks and output position."""
+        return self.state['stages'].setdefault(name, {
+            'done': [],
+            'position': 0,
+            'complete': False
+        })
+
+    def save(self) -> None:
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+class JsonlSink:
+    """Append records to a JSON Lines file.
+
+    The position is the size of the file in bytes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, 'ab')
+
+    def truncate(self, position: int) -> None:
+        self._file.truncate(position)
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self._file.write(
+                json.dumps(record, separators=(',', ':')).encode() + b'\n')
+
+    def flush(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """Write records to numbered Parquet part files in a directory.
+
+    The `data` of each record is stored as a JSON string so that every part
+    shares the same schema. The position is the number of parts written.
+    """
+
+    def __init__(self, path: str) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError('Parquet output requires pyarrow, '
+                              'e.g., pip install pyarrow') from e
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self._buffer: List[dict] = []
+        os.makedirs(path, exist_ok=True)
+        self._parts = len(self._existing())
+
+    def _existing(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.path)
+                      if name.startswith('part-'))
+
+    def truncate(self, position: int) -> None:
+        for name in self._existing()[position:]:
+            os.remove(os.path.join(self.path, name))
+        self._parts = position
+        self._buffer = []
+
+    def write(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self._buffer.append({
+                'key': record['key'],
+                'fetched_at': record['fetched_at'],
+                'data': json.dumps(record['data'], separators=(',', ':'))
+            })
+
+    def flush(self) -> int:
+        if self._buffer:
+            table = self._pa.Table.from_pylist(self._buffer)
+            name = os.path.join(self.path, f'part-{self._parts:06d}.parquet')
+            self._pq.write_table(table, name)
+            self._parts += 1
+            self._buffer = []
+        return self._parts
+
+    def close(self) -> None:
+        self._buffer = []
+
+
+def call_with_retry(func: Callable[..., Any],
+                    *args,
+                    retries: int = 5,
+                    backoff: float = 1.0,
+                    **kwargs) -> Any:
+    """Call `func`, retrying on rate limiting, server and network errors.
+
+    `Retry-After` headers are honored, otherwise the delay doubles with every
+    attempt. No retry is attempted past the current `deadline()`.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except HTTPError as e:
+            response = e.response
+            status = response.status_code if response is not None else None
+            if status not in _RETRY_STATUS or attempt == retries:
+                raise
+            delay = backoff * 2**attempt
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+        except DeadlineExceeded:
+            raise
+        except (ConnectionError, Timeout):
+            if attempt == retries:
+                raise
+            delay = backoff * 2**attempt
+        left = remaining()
+        if left is not None and left <= delay:
+            raise DeadlineExceeded('Deadline exceeded before retrying.')
+        time.sleep(delay)
+
+
+def fetch_pages(fetch: Callable[[int], List[Any]],
+                per_page: int) -> List[Any]:
+    """Get the items of every page, from page 1 until one is not full.
+
+    Args:
+        fetch (callable): Function getting the items of a page.
+        per_page (int): Number of items of a full page.
+    """
+    items = []
+    page = 1
+    while True:
+        batch = fetch(page)
+        items.extend(batch)
+        if len(batch) < per_page:
+            return items
+        page += 1
+
+
+def imap_unordered(func: Callable[[Any], Any],
+                   keys: Iterable[Any],
+                   workers: int,
+                   return_exceptions: bool = False
+                   ) -> Iterator[Tuple[Any, Any]]:
+    """Call `func` on every key concurrently, yielding `(key, result)` as
+    they complete.
+
+    At most `2 * workers` calls are in flight, so `keys` can be a long lazy
+    iterable. The calls keep the deadline and priority of the caller.
+
+    Args:
+        return_exceptions (bool): Yield the exception of a failed call as
+            its result instead of raising it.
+    """
+    if workers <= 1:
+        for key in keys:
+            try:
+                result = func(key)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                result = e
+            yield key, result
+        return
+
+    pending_keys = iter(keys)
+    with ThreadPoolExecutor(workers) as pool:
+
+        def submit(key):
+            return pool.submit(copy_context().run, func, key)
+
+        running = {}
+        for key in pending_keys:
+            running[submit(key)] = key
+            if len(running) >= 2 * workers:
+                break
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                error = future.exception()
+                if error is not None and (not return_exceptions or
+                                          not isinstance(error, Exception)):
+                    raise error
+                yield key, error if error is not None else future.result()
+                for key in pending_keys:
+                    running[submit(key)] = key
+                    break
+
+
+class Crawler:
+    """Snapshot all markets, coins and exchange tickers.
+
+    Run it with as many workers as the latency requires to saturate the rate
+    limit of `cg`, e.g., `CoinGeckoAPI(limiter=RateLimiter(500))` with 8
+    workers for a paid plan.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        output_dir (str): Directory of the output files.
+        checkpoint (str): Location of the checkpoint file. Defaults to
+            `checkpoint.json` in `output_dir`.
+        format (str): `jsonl` or `parquet`.
+        vs_currency (str): Currency of `coins/markets`.
+        workers (int): Number of concurrent calls.
+        retries (int): Number of retries of a failed call.
+        commit_interval (float): Seconds between two checkpoint commits.
+        progress (bool): Whether to display the progress on stderr.
+    """
+
+    def __init__(self,
+                 cg: CoinGeckoAPI,
+                 output_dir: str,
+                 checkpoint: Optional[str] = None,
+                 format: str = 'jsonl',
+                 vs_currency: str = 'usd',
+                 workers: int = 1,
+                 retries: int = 5,
+                 commit_interval: float = 5.0,
+                 progress: bool = True) -> None:
+        if format not in ('jsonl', 'parquet'):
+            raise ValueError("format should be 'jsonl' or 'parquet'.")
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.cg = cg
+        self.output_dir = output_dir
+        self.checkpoint = Checkpoint(
+            checkpoint or os.path.join(output_dir, 'checkpoint.json'))
+        self.format = format
+        self.vs_currency = vs_currency
+        self.workers = workers
+        self.retries = retries
+        self.commit_interval = commit_interval
+        self.progress = progress
+
+    def run(self, stages: Iterable[str] = STAGES) -> None:
+        """Run the given stages, skipping the completed ones."""
+        for name in stages:
+            if name not in STAGES:
+                raise ValueError(f'Unknown stage: {name}')
+            getattr(self, f'_crawl_{name}')()
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        return call_with_retry(func, *args, retries=self.retries, **kwargs)
+
+    def _listing(self, name: str, func: Callable[[], List[dict]]) -> List[str]:
+        """Ids of a listing, fetched once and kept in the checkpoint."""
+        if name not in self.checkpoint.state:
+            self.checkpoint.state[name] = [
+                item['id'] for item in self._call(func)
+            ]
+            self.checkpoint.save()
+        return self.checkpoint.state[name]
+
+    def _open_sink(self, name: str):
+        if self.format == 'parquet':
+            return ParquetSink(os.path.join(self.output_dir, name))
+        return JsonlSink(os.path.join(self.output_dir, f'{name}.jsonl'))
+
+    def _crawl_markets(self) -> None:
+        pages = math.ceil(
+            len(self._listing('coin_ids', self.cg.list_coins)) /
+            MARKETS_PER_PAGE)
+
+        def fetch(page: str) -> List[dict]:
+            rows = self._call(self.cg.list_coins_markets,
+                              self.vs_currency,
+                              params={
+                                  'per_page': MARKETS_PER_PAGE,
+                                  'page': int(page)
+                              })
+            return [_record(row['id'], row) for row in rows]
+
+        self._run_stage('markets', [str(i + 1) for i in range(pages)], fetch)
+
+    def _crawl_coins(self) -> None:
+
+        def fetch(id: str) -> List[dict]:
+            try:
+                return [_record(id, self._call(self.cg.get_coin, id))]
+            except HTTPError as e:
+                # delisted while crawling
+                if e.response is not None and e.response.status_code == 404:
+                    return []
+                raise
+
+        self._run_stage('coins',
+                        self._listing('coin_ids', self.cg.list_coins), fetch)
+
+    def _crawl_tickers(self) -> None:
+
+        def fetch(id: str) -> List[dict]:
+
+            def fetch_page(page: int) -> List[dict]:
+                data = self._call(self.cg.get_exchange_tickers,
+                                  id,
+                                  params={'page': page})
+                return data.get('tickers') or []
+
+            return [
+                _record(id, ticker)
+                for ticker in fetch_pages(fetch_page, TICKERS_PER_PAGE)
+            ]
+
+        self._run_stage('tickers',
+                        self._listing('exchange_ids', self.cg.list_exchanges),
+                        fetch)
+
+    def _run_stage(self, name: str, keys: List[str],
+                   fetch: Callable[[str], List[dict]]) -> None:
+        state = self.checkpoint.stage(name)
+        if state['complete']:
+            return
+
+        sink = self._open_sink(name)
+        # drop records written after the last commit
+        sink.truncate(state['position'])
+        done = set(state['done'])
+        todo = [key for key in keys if key not in done]
+        progress = Progress(name,
+                            len(keys),
+                            len(keys) - len(todo),
+                            stream=sys.stderr if self.progress else None)
+        committed = time.monotonic()
+        try:
+            for key, records in self._map(fetch, todo):
+                sink.write(records)
+                done.add(key)
+                progress.update()
+                if time.monotonic() - committed >= self.commit_interval:
+                    self._commit(state, sink, done)
+                    committed = time.monotonic()
+            self._commit(state, sink, done, complete=True)
+        finally:
+            sink.close()
+            progress.close()
+
+    def _commit(self,
+                state: dict,
+                sink,
+                done: set,
+                complete: bool = False) -> None:
+        state['position'] = sink.flush()
+        state['done'] = sorted(done)
+        state['complete'] = complete
+        self.checkpoint.save()
+
+    def _map(self, fetch: Callable[[str], List[dict]],
+             keys: List[str]) -> Iterator[Tuple[str, List[dict]]]:
+        return imap_unordered(fetch, keys, self.workers)
+
+
+def _record(key: str, data: Any) -> dict:
+    return {'key': key, 'fetched_at': int(time.time()), 'data': data}
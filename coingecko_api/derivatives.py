@@ -0,0 +1,236 @@
+"""Columnar snapshots of the derivatives tickers and their history.
+
+`list_derivatives` returns thousands of tickers with repeated market and
+symbol strings and prices as text. `to_columns` turns a snapshot into one
+float array per field, with the contracts interned. `DerivativesStore`
+appends the snapshots to a SQLite table clustered by contract and time, so
+the funding rate or open interest history of one contract is read without
+going through the other contracts.
+
+Example:
+    >>> collector = DerivativesCollector(cg, DerivativesStore('deriv.db'))
+    >>> collector.collect()  # e.g., every minute
+    >>> history = collector.store.history('Binance (Futures)', 'BTCUSDT')
+    >>> np.frombuffer(history['funding_rate'])
+"""
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple,
+                    Optional, Tuple)
+
+from ._sqlite import connect
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+TIMESTAMP = 'timestamp'
+FIELDS = ('price', 'index', 'basis', 'spread', 'funding_rate',
+          'open_interest', 'volume_24h')
+# the SQL names of the fields, `index` is a keyword
+_COLUMNS = ', '.join(f'"{name}"' for name in FIELDS)
+
+
+def _float(value: Any) -> float:
+    """Number or numeric text as float, NaN if missing."""
+    if value is None or value == '':
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class Snapshot(NamedTuple):
+    """Derivatives tickers at a time, one array per field.
+
+    Attributes:
+        timestamp (int): Milliseconds of the snapshot.
+        contracts (list): Interned `(market, symbol)` of the rows.
+        columns (dict): `float64` array per field of `FIELDS`.
+        last_traded_at (array): `int64` seconds of the last trade per row.
+    """
+    timestamp: int
+    contracts: List[Tuple[str, str]]
+    columns: Dict[str, array]
+    last_traded_at: array
+
+
+def to_columns(tickers: Iterable[dict],
+               timestamp: Optional[int] = None) -> Snapshot:
+    """Turn a `list_derivatives` response into a columnar snapshot.
+
+    Tickers without market or symbol are left out, and the last one of a
+    contract listed twice is kept.
+
+    Args:
+        tickers (list): Response of `list_derivatives`.
+        timestamp (int): Milliseconds of the snapshot, now by default.
+    """
+    rows: Dict[Tuple[str, str], dict] = {}
+    for ticker in tickers:
+        market, symbol = ticker.get('market'), ticker.get('symbol')
+        if market and symbol:
+            rows[(sys.intern(market), sys.intern(symbol))] = ticker
+
+    columns = {
+        name: array('d', (_float(t.get(name)) for t in rows.values()))
+        for name in FIELDS
+    }
+    last_traded_at = array(
+        'q', (int(t.get('last_traded_at') or 0) for t in rows.values()))
+    if timestamp is None:
+        timestamp = int(time.time() * 1000)
+    return Snapshot(timestamp, list(rows), columns, last_traded_at)
+
+
+class DerivativesStore:
+    """Snapshots of the derivatives tickers in a SQLite database.
+
+    Contracts are stored once and referenced by integer ids. Rows are
+    clustered by contract and timestamp, so the history of a contract is a
+    range read.
+
+    Args:
+        path (str): Location of the database file.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, timeout)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS contracts '
+                           '(id INTEGER PRIMARY KEY, market TEXT, symbol TEXT, '
+                           'UNIQUE (market, symbol))')
+        fields = ', '.join(f'"{name}" REAL' for name in FIELDS)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS ticks '
+                           '(contract INTEGER, timestamp INTEGER, '
+                           f'{fields}, last_traded_at INTEGER, '
+                           'PRIMARY KEY (contract, timestamp)) WITHOUT ROWID')
+        self._ids: Dict[Tuple[str, str], int] = {
+            (market, symbol): id
+            for id, market, symbol in self._conn.execute(
+                'SELECT id, market, symbol FROM contracts')
+        }
+
+    def contracts(self) -> List[Tuple[str, str]]:
+        """Get the `(market, symbol)` of the stored contracts."""
+        with self._lock:
+            return [(market, symbol) for market, symbol in self._conn.execute(
+                'SELECT market, symbol FROM contracts ORDER BY id')]
+
+    def _find(self, contract: Tuple[str, str]) -> Optional[int]:
+        id = self._ids.get(contract)
+        if id is None:
+            # another process may have added it
+            row = self._conn.execute(
+                'SELECT id FROM contracts WHERE market = ? AND symbol = ?',
+                contract).fetchone()
+            if row is not None:
+                id = self._ids[contract] = row[0]
+        return id
+
+    def _id(self, contract: Tuple[str, str]) -> int:
+        id = self._find(contract)
+        if id is None:
+            self._conn.execute(
+                'INSERT INTO contracts (market, symbol) VALUES (?, ?)',
+                contract)
+            id = self._find(contract)
+        return id
+
+    def append(self, snapshot: Snapshot) -> int:
+        """Append a snapshot, ignoring the contracts already stored at its
+        timestamp.
+
+        Returns:
+            int: Number of rows appended.
+        """
+        values = [snapshot.columns[name] for name in FIELDS]
+        placeholders = ', '.join('?' * (len(FIELDS) + 3))
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = [(self._id(contract), snapshot.timestamp,
+                         *(column[i] for column in values),
+                         snapshot.last_traded_at[i])
+                        for i, contract in enumerate(snapshot.contracts)]
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    f'INSERT OR IGNORE INTO ticks (contract, timestamp, '
+                    f'{_COLUMNS}, last_traded_at) VALUES ({placeholders})',
+                    rows)
+                appended = self._conn.total_changes - before
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                # ids of a rolled back transaction are not stored
+                self._ids = {
+                    (market, symbol): id
+                    for id, market, symbol in self._conn.execute(
+                        'SELECT id, market, symbol FROM contracts')
+                }
+                raise
+        return appended
+
+    def history(self,
+                market: str,
+                symbol: str,
+                start_ms: Optional[int] = None,
+                end_ms: Optional[int] = None) -> Dict[str, array]:
+        """Get the snapshots of a contract in `[start_ms, end_ms]`.
+
+        Returns:
+            dict: `timestamp` (ms) and `last_traded_at` (s) `int64` arrays,
+            and a `float64` array per field of `FIELDS`.
+        """
+        columns = {TIMESTAMP: array('q')}
+        columns.update((name, array('d')) for name in FIELDS)
+        columns['last_traded_at'] = array('q')
+        with self._lock:
+            id = self._find((market, symbol))
+            if id is None:
+                return columns
+            rows = self._conn.execute(
+                f'SELECT timestamp, {_COLUMNS}, last_traded_at FROM ticks '
+                'WHERE contract = ? AND timestamp BETWEEN ? AND ? '
+                'ORDER BY timestamp',
+                (id, start_ms if start_ms is not None else -2**63,
+                 end_ms if end_ms is not None else 2**63 - 1)).fetchall()
+        appenders = [column.append for column in columns.values()]
+        for row in rows:
+            for append, value in zip(appenders, row):
+                append(value if value is not None else math.nan)
+        return columns
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class DerivativesCollector:
+    """Fetch `list_derivatives` snapshots into a store.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        store (DerivativesStore): Store of the snapshots.
+        params (dict): Parameters of `list_derivatives`, e.g.,
+            `{'include_tickers': 'unexpired'}`.
+    """
+
+    def __init__(self,
+                 cg: 'CoinGeckoAPI',
+                 store: DerivativesStore,
+                 params: Optional[Dict[str, Any]] = None) -> None:
+        self.cg = cg
+        self.store = store
+        self.params = params
+
+    def collect(self, timestamp: Optional[int] = None) -> Snapshot:
+        """Fetch a snapshot and append it to the store."""
+        snapshot = to_columns(self.cg.list_derivatives(self.params), timestamp)
+        self.store.append(snapshot)
+        return snapshot
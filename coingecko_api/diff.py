@@ -0,0 +1,149 @@
+"""Change detection of the reference lists.
+
+`ChangeDetector` keeps the last snapshot of each list with a hash of its
+body and of each record, so that polling a list only returns the records
+added, removed or changed since the previous poll. An unchanged body is
+detected before it is decoded.
+
+Example:
+    >>> detector = ChangeDetector(cg, 'lists.json')
+    >>> changes = detector.diff('coins')
+    >>> for id, coin in changes.added.items():
+    ...     print('new listing', id, coin['name'])
+"""
+import hashlib
+import json
+import os
+from typing import (TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional,
+                    Tuple)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+# path and key field of the records of each list
+LISTS = {
+    'coins': ('coins/list', 'id'),
+    'exchanges': ('exchanges/list', 'id'),
+    'asset_platforms': ('asset_platforms', 'id'),
+    'categories': ('coins/categories/list', 'category_id')
+}
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def record_hash(record: Any) -> str:
+    """Get a hash of a record independent of the order of its keys."""
+    return _digest(
+        json.dumps(record, sort_keys=True,
+                   separators=(',', ':')).encode('utf-8'))
+
+
+class Changes(NamedTuple):
+    """Records of a list changed since the previous snapshot, by key.
+
+    Attributes:
+        added (dict): New records.
+        removed (dict): Records of the previous snapshot no longer listed.
+        changed (dict): `(previous, current)` records.
+    """
+    added: Dict[str, dict]
+    removed: Dict[str, dict]
+    changed: Dict[str, Tuple[dict, dict]]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class ChangeDetector:
+    """Snapshots of the reference lists and their differences.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        path (str): JSON file keeping the snapshots across runs, in memory
+            only if None.
+    """
+
+    def __init__(self, cg: 'CoinGeckoAPI', path: Optional[str] = None) -> None:
+        self.cg = cg
+        self.path = path
+        self.state: Dict[str, dict] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def diff(self,
+             name: str,
+             params: Optional[Dict[str, Any]] = None) -> Changes:
+        """Fetch a list and get its changes since the previous call.
+
+        The first call of a list returns all of its records as added.
+
+        Args:
+            name (str): `coins`, `exchanges`, `asset_platforms` or
+                `categories`.
+            params (dict): Parameters of the list, e.g.,
+                `{'include_platform': 'true'}` for `coins`.
+        """
+        if name not in LISTS:
+            raise ValueError(f'name should be one of {sorted(LISTS)}.')
+        if self.cg.session is None:
+            raise RuntimeError('Session is already closed.')
+        path, key = LISTS[name]
+        response = self.cg._send(path, params=params)
+        body = _digest(response.content)
+        previous = self.state.get(name)
+        if previous is not None and previous['body'] == body:
+            return Changes({}, {}, {})
+
+        records = self.cg._process_response(response)
+        changes = self.compare(name, records, key)
+        self.state[name] = {
+            'body': body,
+            'records': {
+                str(record[key]): [record_hash(record), record]
+                for record in records
+            }
+        }
+        self._save()
+        return changes
+
+    def compare(self, name: str, records: List[dict], key: str) -> Changes:
+        """Get the changes of `records` from the snapshot of a list."""
+        previous = self.state.get(name, {}).get('records', {})
+        added: Dict[str, dict] = {}
+        changed: Dict[str, Tuple[dict, dict]] = {}
+        seen = set()
+        for record in records:
+            id = str(record[key])
+            seen.add(id)
+            old = previous.get(id)
+            if old is None:
+                added[id] = record
+            elif old[0] != record_hash(record):
+                changed[id] = (old[1], record)
+        removed = {
+            id: old[1]
+            for id, old in previous.items() if id not in seen
+        }
+        return Changes(added, removed, changed)
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget the snapshot of a list, or of every list."""
+        if name is None:
+            self.state = {}
+        else:
+            self.state.pop(name, None)
+        self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
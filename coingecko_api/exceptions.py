@@ -0,0 +1,10 @@
+"""Exceptions deriving from the exceptions of `requests`.
+
+Kept apart so that the modules raising them import `requests` only when
+they do.
+"""
+from requests.exceptions import Timeout
+
+
+class DeadlineExceeded(Timeout):
+    """Raised when the deadline of an operation has passed."""
@@ -0,0 +1,146 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# static segments of the API paths, any other segment is a parameter
+_STATIC_SEGMENTS = {
+    'asset_platforms', 'categories', 'coins', 'companies', 'contract',
+    'decentralized_finance_defi', 'derivatives', 'exchange_rates',
+    'exchanges', 'global', 'history', 'indexes', 'list', 'market_chart',
+    'markets', 'ohlc', 'ping', 'price', 'public_treasury', 'range', 'search',
+    'simple', 'supported_vs_currencies', 'tickers', 'token_price', 'trending',
+    'volume_chart'
+}
+
+
+def endpoint_of(path: str) -> str:
+    """Get the endpoint of a path, e.g., `coins/{}/tickers`."""
+    return '/'.join(segment if segment in _STATIC_SEGMENTS else '{}'
+                    for segment in path.split('/'))
+
+
+class EndpointStats:
+    """Counters and recent latencies of an endpoint.
+
+    Attributes:
+        calls (int): Number of responses received.
+        errors (int): Number of calls failed without a response.
+        hedges (int): Number of duplicate calls sent.
+        bytes_received (int): Bytes of the bodies received on the wire.
+        bytes_decoded (int): Bytes of the same bodies once decoded.
+        latencies (deque): Seconds taken by the recent responses.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'hedges': self.hedges,
+            'bytes_received': self.bytes_received,
+            'bytes_decoded': self.bytes_decoded,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95)
+        }
+
+
+class Metrics:
+    """Thread-safe per endpoint statistics of a client.
+
+    Args:
+        window (int): Number of recent latencies kept per endpoint.
+
+    Attributes:
+        endpoints (dict): Statistics per endpoint.
+        connections (dict): Number of responses received on `new` and
+            `reused` connections.
+        http_versions (dict): Number of responses per HTTP version.
+        encodings (dict): Number of responses per content coding, e.g.,
+            `gzip` or `identity`.
+    """
+
+    def __init__(self, window: int = 100) -> None:
+        self.window = window
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.connections = {'new': 0, 'reused': 0}
+        self.http_versions: Dict[str, int] = {}
+        self.encodings: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats(self.window)
+        return stats
+
+    def record(self, endpoint: str, latency: float) -> None:
+        """Record a response received after `latency` seconds."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.calls += 1
+            stats.latencies.append(latency)
+
+    def record_connection(self, http_version: Optional[str],
+                          new: Optional[bool]) -> None:
+        """Record the connection a response was received on."""
+        with self._lock:
+            if http_version is not None:
+                self.http_versions[http_version] = \
+                    self.http_versions.get(http_version, 0) + 1
+            if new is not None:
+                self.connections['new' if new else 'reused'] += 1
+
+    def record_transfer(self, endpoint: str, encoding: str, received: int,
+                        decoded: int) -> None:
+        """Record the bytes of a body before and after decoding."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.bytes_received += received
+            stats.bytes_decoded += decoded
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    def record_error(self, endpoint: str) -> None:
+        """Record a call failed without a response."""
+        with self._lock:
+            self._stats(endpoint).errors += 1
+
+    def record_hedge(self, endpoint: str) -> None:
+        """Record a duplicate call."""
+        with self._lock:
+            self._stats(endpoint).hedges += 1
+
+    def percentile(self,
+                   endpoint: str,
+                   q: float,
+                   min_samples: int = 1) -> Optional[float]:
+        """Get a percentile of the recent latencies of an endpoint.
+
+        Returns:
+            float: Seconds, None if less than `min_samples` latencies.
+        """
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None or len(stats.latencies) < min_samples:
+                return None
+            return stats.percentile(q)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Get the statistics of every endpoint."""
+        with self._lock:
+            return {
+                endpoint: stats.as_dict()
+                for endpoint, stats in self.endpoints.items()
+            }
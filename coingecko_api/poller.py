@@ -0,0 +1,202 @@
+"""Polling of endpoints at intervals adapted to how often they change.
+
+Endpoints such as `get_global` or `get_search_trending` are updated on
+undocumented schedules. `Poller` hashes the responses of each target and
+adapts its interval: it shortens after a change and grows while the
+content is unchanged, within the bounds of the target, so updates are
+caught quickly without spending calls on unchanged data.
+
+Example:
+    >>> poller = Poller(cg, min_interval=30, max_interval=900)
+    >>> for key, data in poller.run():
+    ...     print(key, 'changed')
+"""
+import time
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator,
+                    List, Optional, Tuple)
+
+from requests.exceptions import RequestException
+
+from .diff import record_hash
+from .resilience import CircuitOpenError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+# endpoints with no documented update schedule
+DEFAULT_TARGETS = ('get_global', 'get_global_defi', 'get_search_trending',
+                   'list_indexes_info', 'list_derivatives_exchanges_info')
+
+
+def _target_key(name: str, args: tuple, kwargs: dict) -> str:
+    """Key of a call, e.g. `get_coin_tickers('bitcoin')`."""
+    if not args and not kwargs:
+        return name
+    params = [repr(arg) for arg in args]
+    params += [f'{k}={v!r}' for k, v in sorted(kwargs.items())]
+    return f'{name}({", ".join(params)})'
+
+
+class AdaptiveInterval:
+    """Interval multiplied by `speedup` after a change and by `slowdown`
+    otherwise, within `[min_interval, max_interval]`.
+
+    The interval settles where about `log(slowdown) / log(slowdown /
+    speedup)` of the polls see a change, one in five with the defaults.
+    """
+
+    def __init__(self,
+                 min_interval: float,
+                 max_interval: float,
+                 speedup: float = 0.5,
+                 slowdown: float = 1.2) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError('intervals should satisfy '
+                             '0 < min_interval <= max_interval.')
+        if not 0 < speedup < 1 < slowdown:
+            raise ValueError('speedup should be in (0, 1) and slowdown '
+                             'greater than 1.')
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.value = min_interval
+
+    def update(self, changed: bool) -> float:
+        """Adapt the interval to the result of a poll."""
+        factor = self.speedup if changed else self.slowdown
+        self.value = min(max(self.value * factor, self.min_interval),
+                         self.max_interval)
+        return self.value
+
+
+class Target:
+    """Polled call and its change statistics.
+
+    Attributes:
+        interval (AdaptiveInterval): Interval until the next poll.
+        polls (int): Number of responses compared to a previous one.
+        changes (int): Number of polls which saw a change.
+        next_poll (float): `time.monotonic()` of the next poll.
+        error (Exception): Error of the last poll, if any.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any],
+                 interval: AdaptiveInterval) -> None:
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.digest: Optional[str] = None
+        self.polls = 0
+        self.changes = 0
+        self.next_poll = float('-inf')
+        self.error: Optional[Exception] = None
+
+    def as_dict(self) -> dict:
+        return {
+            'interval': self.interval.value,
+            'polls': self.polls,
+            'changes': self.changes,
+            'error': repr(self.error) if self.error is not None else None
+        }
+
+
+class Poller:
+    """Poll methods of a client, yielding their responses when they change.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        targets (list): Names of methods of `cg` called without arguments.
+        min_interval (float): Default minimum seconds between two polls.
+        max_interval (float): Default maximum seconds between two polls.
+    """
+
+    def __init__(self,
+                 cg: 'CoinGeckoAPI',
+                 targets: Iterable[str] = DEFAULT_TARGETS,
+                 min_interval: float = 10.0,
+                 max_interval: float = 900.0) -> None:
+        self.cg = cg
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.targets: Dict[str, Target] = {}
+        for name in targets:
+            self.add(name)
+
+    def add(self,
+            name: str,
+            *args,
+            key: Optional[str] = None,
+            min_interval: Optional[float] = None,
+            max_interval: Optional[float] = None,
+            **kwargs) -> Target:
+        """Poll a method of the client with the given arguments.
+
+        Targets are keyed by `key`, by default the name of the method and
+        its arguments, e.g. `get_coin_tickers('bitcoin')`. Adding a target
+        with the key of another one replaces it.
+
+        Example:
+            >>> poller.add('get_coin_tickers', 'bitcoin', min_interval=60)
+        """
+        method = getattr(self.cg, name)
+        interval = AdaptiveInterval(
+            min_interval if min_interval is not None else self.min_interval,
+            max_interval if max_interval is not None else self.max_interval)
+        if key is None:
+            key = _target_key(name, args, kwargs)
+        target = Target(key, lambda: method(*args, **kwargs), interval)
+        self.targets[key] = target
+        return target
+
+    def poll(self, now: Optional[float] = None) -> List[Tuple[str, Any]]:
+        """Poll the targets which are due.
+
+        The first response of a target counts as a change. Failed polls are
+        retried after the same interval, with the error kept in the target.
+
+        Returns:
+            list: `(key, data)` of the targets which changed.
+        """
+        now = time.monotonic() if now is None else now
+        changed = []
+        for target in self.targets.values():
+            if target.next_poll > now:
+                continue
+            try:
+                data = target.func()
+            except (RequestException, CircuitOpenError) as e:
+                target.error = e
+                target.next_poll = now + target.interval.value
+                continue
+
+            target.error = None
+            digest = record_hash(data)
+            if target.digest is None:
+                changed.append((target.name, data))
+            else:
+                target.polls += 1
+                if digest != target.digest:
+                    target.changes += 1
+                    changed.append((target.name, data))
+                target.interval.update(digest != target.digest)
+            target.digest = digest
+            target.next_poll = now + target.interval.value
+        return changed
+
+    def next_poll(self) -> float:
+        """Get `time.monotonic()` of the next due target."""
+        return min((t.next_poll for t in self.targets.values()),
+                   default=float('inf'))
+
+    def run(self) -> Iterator[Tuple[str, Any]]:
+        """Poll forever, yielding `(key, data)` of the changed targets."""
+        while True:
+            yield from self.poll()
+            delay = self.next_poll() - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def stats(self) -> Dict[str, dict]:
+        """Get the interval and change statistics of every target."""
+        return {name: t.as_dict() for name, t in self.targets.items()}
@@ -0,0 +1,220 @@
+"""Prices in many currencies from a single anchor currency.
+
+`get_exchange_rates` returns the value of one BTC in every supported
+currency, so a price in the anchor currency converts to any of them with one
+multiplication. Pricing N coins in M currencies then takes one call for the
+prices and one cached call for the rates, instead of N x M conversions done
+by the API.
+
+Derived prices may differ slightly from the ones computed by CoinGecko, and
+24h changes are only available in the anchor currency.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+from . import CoinGeckoAPI, _check_params
+from .crawl import imap_unordered
+
+# suffixes of get_simple_price values proportional to the price
+_CONVERTIBLE = ('_market_cap', '_24h_vol')
+
+
+class ExchangeRates:
+    """Cached table of the rates of `get_exchange_rates`.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        max_age (float): Seconds before the rates are fetched again.
+
+    Attributes:
+        fetched_at (float): When the rates were fetched, 0 if never.
+    """
+
+    def __init__(self, cg: CoinGeckoAPI, max_age: float = 60.0) -> None:
+        self.cg = cg
+        self.max_age = max_age
+        self.fetched_at = 0.0
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def values(self) -> Dict[str, float]:
+        """Get the value of one BTC per currency, refreshed if too old."""
+        with self._lock:
+            if time.time() - self.fetched_at >= self.max_age:
+                rates = self.cg.get_exchange_rates()['rates']
+                self._values = {
+                    currency: float(rate['value'])
+                    for currency, rate in rates.items()
+                }
+                self.fetched_at = time.time()
+            return self._values
+
+    def factors(self, anchor: str,
+                currencies: Iterable[str]) -> Dict[str, float]:
+        """Get the multipliers converting `anchor` amounts to `currencies`.
+
+        Currencies missing from the table are left out.
+        """
+        values = self.values()
+        base = values.get(anchor)
+        if not base:
+            raise ValueError(f'No exchange rate for {anchor}.')
+        return {
+            currency: values[currency] / base
+            for currency in currencies if currency in values
+        }
+
+
+class Pricer:
+    """Get prices in many currencies from the prices in one anchor currency.
+
+    Currencies missing from the exchange rates are fetched with
+    `get_simple_price`.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        anchor (str): Currency of the prices fetched from the API.
+        max_age (float): Seconds before the exchange rates are fetched again.
+
+    Example:
+        >>> pricer = Pricer(cg)
+        >>> pricer.get_simple_price(['bitcoin', 'ethereum'], ['eur', 'jpy'])
+    """
+
+    def __init__(self,
+                 cg: CoinGeckoAPI,
+                 anchor: str = 'usd',
+                 max_age: float = 60.0) -> None:
+        self.cg = cg
+        self.anchor = anchor
+        self.rates = ExchangeRates(cg, max_age)
+
+    def convert(self, prices: Dict[str, dict],
+                vs_currencies: List[str]) -> Dict[str, dict]:
+        """Convert a `get_simple_price` response in the anchor currency."""
+        factors = self.rates.factors(self.anchor, vs_currencies)
+        anchor = self.anchor
+        result = {}
+        for id, values in prices.items():
+            converted = {}
+            price = values.get(anchor)
+            for currency, factor in factors.items():
+                if price is not None:
+                    converted[currency] = price * factor
+                for suffix in _CONVERTIBLE:
+                    value = values.get(anchor + suffix)
+                    if value is not None:
+                        converted[currency + suffix] = value * factor
+            if anchor in factors:
+                # the anchor keeps every value, including 24h changes
+                converted.update(values)
+            elif 'last_updated_at' in values:
+                converted['last_updated_at'] = values['last_updated_at']
+            result[id] = converted
+        return result
+
+    def get_simple_price(self,
+                         ids: Union[str, List[str]],
+                         vs_currencies: Union[str, List[str]],
+                         params: Optional[dict] = None) -> Dict[str, dict]:
+        """Get the current price of cryptocurrencies, like
+        `CoinGeckoAPI.get_simple_price`."""
+        if params:
+            _check_params(params)
+        if type(vs_currencies) != list:
+            vs_currencies = vs_currencies.split(',')
+
+        prices = self.cg.get_simple_price(ids, self.anchor, params)
+        result = self.convert(prices, vs_currencies)
+
+        missing = [
+            currency for currency in vs_currencies
+            if currency not in self.rates.values()
+        ]
+        if missing:
+            direct = self.cg.get_simple_price(ids, missing, params)
+            for id, values in direct.items():
+                result.setdefault(id, {}).update(values)
+        return result
+
+
+def _chunks(base_length: int, addresses: List[str],
+            max_url_length: int) -> List[List[str]]:
+    """Split addresses in chunks whose URL fits in `max_url_length`."""
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    length = base_length
+    for address in addresses:
+        # addresses are joined by encoded commas (%2C)
+        size = len(address) + (3 if chunk else 0)
+        if chunk and length + size > max_url_length:
+            chunks.append(chunk)
+            chunk, length, size = [], base_length, len(address)
+        chunk.append(address)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def get_token_prices(
+        cg: CoinGeckoAPI,
+        tokens: Iterable[Tuple[str, str]],
+        vs_currencies: Union[str, List[str]],
+        params: Optional[dict] = None,
+        max_url_length: int = 2000,
+        workers: int = 8) -> Dict[Tuple[str, str], dict]:
+    """Get the current price of tokens of many platforms.
+
+    Tokens are grouped by platform and each group is split in as few
+    `get_simple_token_price` calls as the URL length allows. The calls are
+    made concurrently under the rate limiter, deadline and priority of the
+    caller.
+
+    Args:
+        tokens (list): `(platform, contract_address)` pairs, e.g.,
+            `('ethereum', '0x...')`.
+        vs_currencies (str or list): Currencies of the prices.
+        params (dict): Additional parameters of `get_simple_token_price`.
+        max_url_length (int): Maximum length of the URL of a call.
+        workers (int): Number of concurrent calls.
+
+    Returns:
+        dict: Prices per `(platform, lowercase address)`, tokens without a
+        price are left out.
+
+    Example:
+        >>> get_token_prices(cg, [('ethereum', usdc), ('polygon-pos', wmatic)],
+        ...                  'usd')
+    """
+    if params:
+        _check_params(params)
+    vs_str = ','.join(vs_currencies) if type(
+        vs_currencies) == list else vs_currencies
+
+    platforms: Dict[str, Dict[str, None]] = {}
+    for platform, address in tokens:
+        platforms.setdefault(platform, {})[address.lower()] = None
+
+    calls = []
+    for platform, addresses in platforms.items():
+        query = urlencode(
+            dict(params or {}, contract_addresses='', vs_currencies=vs_str))
+        base_length = len(f'{cg._ENDPOINT}simple/token_price/{platform}?'
+                          f'{query}')
+        for chunk in _chunks(base_length, list(addresses), max_url_length):
+            calls.append((platform, chunk))
+    if not calls:
+        return {}
+
+    def fetch(call: Tuple[str, List[str]]) -> dict:
+        platform, chunk = call
+        return cg.get_simple_token_price(platform, chunk, vs_str, params)
+
+    result: Dict[Tuple[str, str], dict] = {}
+    for (platform, _), prices in imap_unordered(fetch, calls, workers):
+        for address, price in prices.items():
+            result[(platform, address.lower())] = price
+    return result
@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional
+
+from ._deadline import bound_wait
+from ._sqlite import connect
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting the rate of API calls.
+
+    Args:
+        calls (int): Number of calls allowed per `period`.
+        period (float): Length of the window in seconds.
+        burst (int): Maximum number of calls that can be made back to back.
+            Defaults to 1 so that calls are spread evenly over the period.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens in the bucket.
+    """
+
+    def __init__(self,
+                 calls: int,
+                 period: float = 60.0,
+                 burst: Optional[int] = None) -> None:
+        if calls <= 0 or period <= 0:
+            raise ValueError('calls and period should be positive.')
+
+        self.rate = calls / period
+        self.capacity = float(burst if burst is not None else 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until the next
+            token is available.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, priority: Optional[str] = None) -> float:
+        """Block until a token is available and take it.
+
+        Args:
+            priority (str): Ignored, accepted for compatibility with
+                schedulers sharing the same interface.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            DeadlineExceeded: The next token comes after the deadline.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if not delay:
+                return waited
+            time.sleep(bound_wait(delay))
+            waited += delay
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Token bucket shared by the processes of a host.
+
+    The bucket is stored in a SQLite database and updated in exclusive
+    transactions, so that all the workers using the same API key respect its
+    limit together.
+
+    Args:
+        path (str): Location of the database file.
+        calls (int): Number of calls allowed per `period`.
+        period (float): Length of the window in seconds.
+        burst (int): Maximum number of calls that can be made back to back.
+        name (str): Name of the bucket, e.g., one per API key.
+        timeout (float): Seconds to wait for a lock held by another process.
+    """
+
+    def __init__(self,
+                 path: str,
+                 calls: int,
+                 period: float = 60.0,
+                 burst: Optional[int] = None,
+                 name: str = 'default',
+                 timeout: float = 30.0) -> None:
+        super().__init__(calls, period, burst)
+        self.path = path
+        self.name = name
+        self._conn = connect(path, timeout)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS buckets '
+                           '(name TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+
+    def try_acquire(self) -> float:
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    'SELECT tokens, updated FROM buckets WHERE name = ?',
+                    (self.name, )).fetchone()
+                # monotonic clocks are not comparable across processes
+                now = time.time()
+                if row is None:
+                    tokens = self.capacity
+                else:
+                    elapsed = max(now - row[1], 0.0)
+                    tokens = min(self.capacity, row[0] + elapsed * self.rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    delay = 0.0
+                else:
+                    delay = (1 - tokens) / self.rate
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)',
+                    (self.name, tokens, now))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return delay
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+INTERACTIVE = 'interactive'
+DEFAULT = 'default'
+BULK = 'bulk'
+PRIORITIES = (INTERACTIVE, DEFAULT, BULK)
+
+_priority: ContextVar[Optional[str]] = ContextVar('priority', default=None)
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Set the priority class of the calls made in the block.
+
+    Example:
+        >>> with priority(BULK):
+        ...     cg.get_coin_history('bitcoin', '01-10-2021')
+    """
+    if name not in PRIORITIES:
+        raise ValueError(f'priority should be one of {PRIORITIES}.')
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(default: Optional[str] = None) -> str:
+    """Get the priority class of the current context."""
+    return _priority.get() or default or DEFAULT
+
+
+class PriorityScheduler:
+    """Dispatch calls of several priority classes under one rate budget.
+
+    Waiting calls are dispatched in the order of `PRIORITIES`, so interactive
+    calls jump ahead of queued bulk work. A class can be guaranteed a minimum
+    share of the recent dispatches so that it still makes progress.
+
+    Args:
+        limiter (RateLimiter): Rate budget shared by all classes.
+        min_share (dict): Minimum share of the dispatches per class while it
+            has waiting calls, e.g., `{'bulk': 0.2}`.
+        window (int): Number of recent dispatches the shares are computed on.
+    """
+
+    def __init__(self,
+                 limiter: RateLimiter,
+                 min_share: Optional[Dict[str, float]] = None,
+                 window: int = 100) -> None:
+        min_share = min_share or {}
+        for name, share in min_share.items():
+            if name not in PRIORITIES:
+                raise ValueError(f'priority should be one of {PRIORITIES}.')
+            if not 0 <= share < 1:
+                raise ValueError('min_share should be in [0, 1).')
+
+        self.limiter = limiter
+        self.min_share = min_share
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, Deque[object]] = {
+            name: deque()
+            for name in PRIORITIES
+        }
+        self._recent: Deque[str] = deque(maxlen=window)
+
+    def _share(self, name: str) -> float:
+        if not self._recent:
+            return 0.0
+        return self._recent.count(name) / len(self._recent)
+
+    def _next(self) -> Optional[object]:
+        for name, share in self.min_share.items():
+            if self._waiting[name] and self._share(name) < share:
+                return self._waiting[name][0]
+        for name in PRIORITIES:
+            if self._waiting[name]:
+                return self._waiting[name][0]
+        return None
+
+    def acquire(self, priority: Optional[str] = None) -> float:
+        """Block until the call is dispatched.
+
+        Args:
+            priority (str): Priority class of the call.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            DeadlineExceeded: The call is not dispatched by the deadline.
+        """
+        name = priority or DEFAULT
+        if name not in PRIORITIES:
+            raise ValueError(f'priority should be one of {PRIORITIES}.')
+
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            self._waiting[name].append(ticket)
+            try:
+                while True:
+                    if self._next() is ticket:
+                        delay = self.limiter.try_acquire()
+                        if not delay:
+                            break
+                        # a more urgent call may arrive in the meantime
+                        self._cond.wait(bound_wait(delay))
+                    else:
+                        self._cond.wait(bound_wait(None))
+            finally:
+                self._waiting[name].remove(ticket)
+                self._cond.notify_all()
+            self._recent.append(name)
+        return time.monotonic() - start
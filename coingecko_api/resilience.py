@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from .metrics import Metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected by an open circuit."""
+
+
+class _Circuit:
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        # time of the opening or of the last trial call
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """Per endpoint circuit breaker failing fast on failing endpoints.
+
+    After `failure_threshold` consecutive failures (network errors or 5xx
+    responses) of an endpoint, its calls are rejected with
+    `CircuitOpenError` for `recovery_timeout` seconds. A single trial call
+    is then let through: its success closes the circuit, its failure opens it
+    again. A trial call which records neither, e.g., interrupted by a
+    deadline, is replaced by another one after `recovery_timeout` seconds.
+
+    Args:
+        failure_threshold (int): Consecutive failures opening the circuit.
+        recovery_timeout (float): Seconds before a trial call.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def state(self, endpoint: str) -> str:
+        """Get the state of the circuit of an endpoint."""
+        with self._lock:
+            return self._circuit(endpoint).state
+
+    def allow(self, endpoint: str) -> None:
+        """Check a call to an endpoint is allowed.
+
+        Raises:
+            CircuitOpenError: If the circuit of the endpoint is open.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            if now - circuit.opened_at >= self.recovery_timeout:
+                circuit.state = HALF_OPEN
+                circuit.opened_at = now
+                return
+        raise CircuitOpenError(f'Circuit of {endpoint} is open.')
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.state = CLOSED
+            circuit.failures = 0
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures += 1
+            if (circuit.state == HALF_OPEN
+                    or circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+
+class Hedging:
+    """Send a duplicate of slow idempotent calls.
+
+    When a GET call has not answered after a percentile of the recent
+    latencies of its endpoint, the same call is sent again from a thread of
+    the pool. The call itself is sent from the thread of the caller, whose
+    response is used unless it fails, e.g., times out on a stalled
+    connection, in which case the response of the duplicate is used.
+    Duplicates go through the rate limiter like any other call and keep the
+    deadline of the caller.
+
+    Args:
+        percentile (float): Percentile of the recent latencies after which a
+            duplicate is sent.
+        min_samples (int): Number of latencies required before an endpoint is
+            hedged.
+        min_delay (float): Minimum seconds before a duplicate is sent.
+        max_workers (int): Number of threads sending the duplicates.
+    """
+
+    def __init__(self,
+                 percentile: float = 0.95,
+                 min_samples: int = 20,
+                 min_delay: float = 0.05,
+                 max_workers: int = 8) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError('percentile should be in (0, 1).')
+
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+
+    def delay(self, metrics: Metrics, endpoint: str) -> Optional[float]:
+        """Get seconds before a duplicate call, None to wait for the call."""
+        latency = metrics.percentile(endpoint, self.percentile,
+                                     self.min_samples)
+        if latency is None:
+            return None
+        return max(latency, self.min_delay)
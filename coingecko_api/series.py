@@ -0,0 +1,274 @@
+"""Memory-mapped on-disk format for historical series.
+
+A series is a directory holding one file of fixed-width values per column
+(`int64` timestamps in milliseconds, `float64` values) and a small
+`index.json` with the number of committed rows::
+
+    bitcoin-usd/
+        index.json
+        timestamp.bin
+        price.bin
+        ...
+
+Appending writes the columns first and commits the index last, so readers
+never see a partial row. Readers memory-map the columns: opening a series is
+O(1) and processes reading the same series share the page cache.
+Columns are exposed as `memoryview` objects, e.g., `np.frombuffer(view)`
+wraps them in NumPy arrays without copying.
+"""
+import bisect
+import json
+import math
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TIMESTAMP = 'timestamp'
+CHART_COLUMNS = ('price', 'market_cap', 'total_volume')
+OHLC_COLUMNS = ('open', 'high', 'low', 'close')
+_INDEX = 'index.json'
+_ITEMSIZE = {'q': 8, 'd': 8}
+
+
+def _read_index(path: str) -> dict:
+    with open(os.path.join(path, _INDEX), encoding='utf-8') as f:
+        index = json.load(f)
+    if index['byteorder'] != sys.byteorder:
+        raise ValueError(f'{path} was written with {index["byteorder"]} '
+                         'byte order.')
+    return index
+
+
+def chart_columns(chart: dict) -> Dict[str, list]:
+    """Get the columns of a market chart response.
+
+    Market caps and volumes missing at a timestamp of the prices are NaN.
+    """
+    columns: Dict[str, list] = {
+        TIMESTAMP: [int(ts) for ts, _ in chart.get('prices', [])],
+        'price': [float(v) for _, v in chart.get('prices', [])]
+    }
+    for name, key in (('market_cap', 'market_caps'), ('total_volume',
+                                                      'total_volumes')):
+        values = {int(ts): v for ts, v in chart.get(key, [])}
+        columns[name] = [
+            float(values[ts]) if values.get(ts) is not None else math.nan
+            for ts in columns[TIMESTAMP]
+        ]
+    return columns
+
+
+def ohlc_columns(ohlc: List[list]) -> Dict[str, list]:
+    """Get the columns of a `get_coin_ohlc` response."""
+    columns: Dict[str, list] = {TIMESTAMP: [int(row[0]) for row in ohlc]}
+    for i, name in enumerate(OHLC_COLUMNS, 1):
+        columns[name] = [float(row[i]) for row in ohlc]
+    return columns
+
+
+class SeriesWriter:
+    """Append rows to a series, creating it if needed.
+
+    Rows whose timestamp is not after the last one are skipped, so that
+    overlapping fetches can be appended as they are.
+
+    Args:
+        path (str): Directory of the series.
+        columns (list): Names of the value columns of a new series.
+    """
+
+    def __init__(self,
+                 path: str,
+                 columns: Sequence[str] = CHART_COLUMNS) -> None:
+        self.path = path
+        if os.path.exists(os.path.join(path, _INDEX)):
+            self.index = _read_index(path)
+        else:
+            os.makedirs(path, exist_ok=True)
+            formats = {TIMESTAMP: 'q'}
+            formats.update((name, 'd') for name in columns)
+            self.index = {
+                'version': 1,
+                'byteorder': sys.byteorder,
+                'columns': formats,
+                'rows': 0
+            }
+            self._commit()
+
+        self._files = {}
+        for name, fmt in self.index['columns'].items():
+            f = open(self._column_path(name), 'ab')
+            # drop the values of an uncommitted append
+            f.truncate(self.index['rows'] * _ITEMSIZE[fmt])
+            self._files[name] = f
+        self.last_timestamp = self._last_timestamp()
+
+    @property
+    def columns(self) -> List[str]:
+        return [name for name in self.index['columns'] if name != TIMESTAMP]
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.bin')
+
+    def _last_timestamp(self) -> Optional[int]:
+        if not self.index['rows']:
+            return None
+        with open(self._column_path(TIMESTAMP), 'rb') as f:
+            f.seek((self.index['rows'] - 1) * 8)
+            return memoryview(f.read(8)).cast('q')[0]
+
+    def _commit(self) -> None:
+        tmp = os.path.join(self.path, _INDEX + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, _INDEX))
+
+    def append(self, columns: Dict[str, Sequence]) -> int:
+        """Append rows sorted by timestamp.
+
+        Args:
+            columns (dict): Sequences of the same length per column, e.g.,
+                `chart_columns(cg.get_coin_market_chart_range(...))`.
+
+        Returns:
+            int: Number of rows appended.
+        """
+        if set(columns) != set(self.index['columns']):
+            raise ValueError(f'columns should be '
+                             f'{sorted(self.index["columns"])}.')
+        timestamps = columns[TIMESTAMP]
+        start = 0
+        if self.last_timestamp is not None:
+            start = bisect.bisect_right(timestamps, self.last_timestamp)
+        if start == len(timestamps):
+            return 0
+
+        appended = len(timestamps) - start
+        arrays = {}
+        for name, fmt in self.index['columns'].items():
+            values = columns[name][start:]
+            if len(values) != appended:
+                raise ValueError('columns should have the same length.')
+            arrays[name] = array(fmt, values)
+
+        rows = self.index['rows']
+        try:
+            for name, values in arrays.items():
+                self._files[name].write(values.tobytes())
+            for f in self._files.values():
+                f.flush()
+                os.fsync(f.fileno())
+            self.index['rows'] = rows + appended
+            self._commit()
+        except BaseException:
+            # keep the columns aligned for the next append
+            self.index['rows'] = rows
+            for name, fmt in self.index['columns'].items():
+                self._files[name].truncate(rows * _ITEMSIZE[fmt])
+            raise
+        self.last_timestamp = int(timestamps[-1])
+        return appended
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self) -> 'SeriesWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Series:
+    """Read-only memory-mapped series.
+
+    Views returned by the series should be released before it is closed.
+
+    Args:
+        path (str): Directory of the series.
+
+    Attributes:
+        rows (int): Number of committed rows when the series was opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        index = _read_index(path)
+        self.rows: int = index['rows']
+        self.formats: Dict[str, str] = index['columns']
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._views: Dict[str, memoryview] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return [name for name in self.formats if name != TIMESTAMP]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> memoryview:
+        """Get a zero-copy view of a column."""
+        view = self._views.get(name)
+        if view is None:
+            fmt = self.formats[name]
+            size = self.rows * _ITEMSIZE[fmt]
+            if not size:
+                view = memoryview(b'').cast(fmt)
+            else:
+                with open(os.path.join(self.path, f'{name}.bin'), 'rb') as f:
+                    self._maps[name] = mmap.mmap(f.fileno(),
+                                                 size,
+                                                 access=mmap.ACCESS_READ)
+                view = memoryview(self._maps[name]).cast(fmt)
+            self._views[name] = view
+        return view
+
+    def range(self, start_ms: int, end_ms: int) -> Tuple[int, int]:
+        """Get the row slice of the timestamps in `[start_ms, end_ms]`."""
+        timestamps = self[TIMESTAMP]
+        return (bisect.bisect_left(timestamps, start_ms),
+                bisect.bisect_right(timestamps, end_ms))
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for m in self._maps.values():
+            m.close()
+        self._views = {}
+        self._maps = {}
+
+    def __enter__(self) -> 'Series':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def save_chart(path: str, chart: dict) -> int:
+    """Append a market chart response to a series.
+
+    Returns:
+        int: Number of rows appended.
+    """
+    with SeriesWriter(path, CHART_COLUMNS) as writer:
+        return writer.append(chart_columns(chart))
+
+
+def save_ohlc(path: str, ohlc: List[list]) -> int:
+    """Append a `get_coin_ohlc` response to a series.
+
+    Returns:
+        int: Number of rows appended.
+    """
+    with SeriesWriter(path, OHLC_COLUMNS) as writer:
+        return writer.append(ohlc_columns(ohlc))
+
+
+def open_series(path: str) -> Series:
+    """Open a series for reading."""
+    return Series(path)
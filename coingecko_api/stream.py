@@ -0,0 +1,105 @@
+"""Write raw response bodies to files instead of decoding them.
+
+Calls made in a `stream_to()` block write the body of their response to the
+sink in chunks, optionally gzip-compressed, and return a `StreamResult`
+instead of the decoded data. Peak memory stays at the chunk size, except with
+the `http2` transport which reads the bodies at once.
+
+Example:
+    >>> with stream_to('bitcoin-max.json.gz', compress='gzip'):
+    ...     result = cg.get_coin_market_chart('bitcoin', 'usd', 'max')
+    >>> result.size, result.sha256
+"""
+import gzip
+import hashlib
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Iterator, NamedTuple, Optional, Union
+
+from requests import Response
+
+Sink = Union[str, 'os.PathLike[str]', IO[bytes]]
+
+_COMPRESSIONS = (None, 'gzip')
+
+
+class StreamResult(NamedTuple):
+    """Metadata of a response written to a sink.
+
+    Attributes:
+        status (int): HTTP status of the response.
+        size (int): Bytes of the (uncompressed) body.
+        sha256 (str): Hex digest of the (uncompressed) body.
+        url (str): URL of the call.
+    """
+    status: int
+    size: int
+    sha256: str
+    url: str
+
+
+class _Target(NamedTuple):
+    sink: Sink
+    compress: Optional[str]
+    chunk_size: int
+
+
+_target: ContextVar[Optional[_Target]] = ContextVar('stream_to',
+                                                    default=None)
+
+
+@contextmanager
+def stream_to(sink: Sink,
+              compress: Optional[str] = None,
+              chunk_size: int = 64 * 1024) -> Iterator[None]:
+    """Write the body of the calls made in the block to a sink.
+
+    Each call overwrites a file sink, while a file-like sink gets the bodies
+    one after the other. Cached responses are not used.
+
+    Args:
+        sink (str or file): Path of a file, or binary file-like object.
+        compress (str): None or `gzip`.
+        chunk_size (int): Bytes read from the network at a time.
+    """
+    if compress not in _COMPRESSIONS:
+        raise ValueError(f'compress should be one of {_COMPRESSIONS}.')
+    if chunk_size <= 0:
+        raise ValueError('chunk_size should be positive.')
+    token = _target.set(_Target(sink, compress, chunk_size))
+    try:
+        yield
+    finally:
+        _target.reset(token)
+
+
+def current_target() -> Optional[_Target]:
+    """Get the sink of the current context, if any."""
+    return _target.get()
+
+
+def write_response(response: Response, target: _Target) -> StreamResult:
+    """Write the body of a streamed response to a sink, then close it."""
+    digest = hashlib.sha256()
+    size = 0
+    sink = target.sink
+    owned = isinstance(sink, (str, os.PathLike))
+    f = open(sink, 'wb') if owned else sink
+    try:
+        out = gzip.GzipFile(fileobj=f, mode='wb') \
+            if target.compress == 'gzip' else f
+        try:
+            for chunk in response.iter_content(target.chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+        finally:
+            if out is not f:
+                out.close()
+    finally:
+        response.close()
+        if owned:
+            f.close()
+    return StreamResult(response.status_code, size, digest.hexdigest(),
+                        response.url)
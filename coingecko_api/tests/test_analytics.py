@@ -0,0 +1,133 @@
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+
+np = pytest.importorskip('numpy')
+
+from coingecko_api.analytics import (align, columns, interval_ms, log_returns,
+                                     ohlc, price_matrix, resample,
+                                     rolling_volatility, simple_returns, stack,
+                                     vwap)
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+chart = {
+    'prices': [[0, 10.0], [60_000, 12.0], [120_000, 9.0], [3_600_000, 11.0]],
+    'total_volumes': [[0, 100.0], [60_000, 110.0], [120_000, 120.0],
+                      [3_600_000, 130.0]]
+}
+
+
+def test_interval_ms():
+    """Test parsing intervals."""
+    assert interval_ms('15m') == 900_000
+    assert interval_ms(1000) == 1000
+    with pytest.raises(ValueError):
+        interval_ms('1w')
+
+
+def test_columns():
+    """Test columnar arrays of a chart."""
+    timestamps, prices = columns(chart)
+    assert timestamps.dtype == np.int64
+    assert prices.tolist() == [10.0, 12.0, 9.0, 11.0]
+
+
+def test_resample():
+    """Test resampling to hourly bars."""
+    bars, values = resample(*columns(chart), '1h', how='mean')
+    assert bars.tolist() == [0, 3_600_000]
+    assert values.tolist() == [pytest.approx(31 / 3), 11.0]
+    with pytest.raises(ValueError):
+        resample(*columns(chart), '1h', how='median')
+
+
+def test_resample_2d():
+    """Test resampling many series at once."""
+    timestamps, prices = columns(chart)
+    values = np.stack([prices, prices * 2])
+    for how in ('first', 'last', 'min', 'max', 'sum', 'mean'):
+        bars, out = resample(timestamps, values, '1h', how=how)
+        assert out.shape == (2, 2)
+        assert out.tolist() == [
+            resample(timestamps, row, '1h', how=how)[1].tolist()
+            for row in values
+        ]
+    assert resample(timestamps[:0], values[:, :0], '1h')[1].shape == (2, 0)
+
+
+def test_ohlc():
+    """Test OHLC bars."""
+    timestamps, prices = columns(chart)
+    bars = ohlc(timestamps, prices, '1h', columns(chart, 'total_volumes')[1])
+    assert bars['open'].tolist() == [10.0, 11.0]
+    assert bars['high'].tolist() == [12.0, 11.0]
+    assert bars['low'].tolist() == [9.0, 11.0]
+    assert bars['close'].tolist() == [9.0, 11.0]
+    assert bars['volume'].tolist() == [120.0, 130.0]
+    assert len(ohlc(timestamps[:0], prices[:0], '1h')['open']) == 0
+
+
+def test_returns():
+    """Test batched returns of series of different lengths."""
+    values = stack([np.array([1.0, 2.0, 4.0]), np.array([1.0, 1.5])])
+    assert simple_returns(values)[0].tolist() == [1.0, 1.0]
+    assert np.allclose(log_returns(values)[1, 0], np.log(1.5))
+    assert np.isnan(log_returns(values)[1, 1])
+
+
+def test_rolling_volatility():
+    """Test rolling standard deviation against NumPy."""
+    returns = np.random.default_rng(0).normal(size=(3, 50))
+    vol = rolling_volatility(returns, 10)
+    assert np.isnan(vol[:, :9]).all()
+    assert np.allclose(vol[:, 9], returns[:, :10].std(axis=1, ddof=1))
+    assert np.allclose(vol[:, -1], returns[:, -10:].std(axis=1, ddof=1))
+
+
+def test_rolling_volatility_nan():
+    """Test NaN only affects the windows containing it."""
+    returns = np.random.default_rng(0).normal(size=20)
+    returns[0] = returns[12] = np.nan
+    vol = rolling_volatility(returns, 5)
+    assert np.isnan(vol[:5]).all()
+    assert np.allclose(vol[5:12], [returns[i - 4:i + 1].std(ddof=1)
+                                   for i in range(5, 12)])
+    assert np.isnan(vol[12:17]).all()
+    assert np.allclose(vol[-1], returns[-5:].std(ddof=1))
+
+
+def test_vwap():
+    """Test batched VWAP ignoring padding."""
+    prices = stack([np.array([10.0, 20.0]), np.array([5.0])])
+    volumes = stack([np.array([1.0, 3.0]), np.array([2.0])])
+    assert vwap(prices, volumes).tolist() == [17.5, 5.0]
+
+
+def test_align():
+    """Test aligning charts with missing bars."""
+    other = {'prices': [[3_600_000, 1.0], [3 * 3_600_000, 3.0]]}
+    grid, values, observed = align([chart, other], 0, 3 * 3_600_000, '1h')
+
+    assert grid.tolist() == [0, 3_600_000, 7_200_000, 10_800_000]
+    assert observed[:, 1].tolist() == [False, True, False, True]
+    assert values[:, 0].tolist() == [9.0, 11.0, 11.0, 11.0]
+    assert np.isnan(values[0, 1])
+    assert values[1:, 1].tolist() == [1.0, 1.0, 3.0]
+
+    _, values, _ = align([other], 0, 3 * 3_600_000, '1h', ffill=False)
+    assert np.isnan(values[2, 0])
+
+
+@responses.activate
+def test_price_matrix():
+    """Test fetching and aligning many coins."""
+    for id in ('bitcoin', 'ethereum'):
+        responses.add(responses.GET,
+                      END_POINTS + f'coins/{id}/market_chart/range',
+                      json=chart)
+
+    m = price_matrix(CoinGeckoAPI(), ['bitcoin', 'ethereum'], 'usd', 0, 3600)
+    assert m.ids == ['bitcoin', 'ethereum']
+    assert m.values.shape == (2, 2)
+    assert m.values[:, 1].tolist() == [9.0, 11.0]
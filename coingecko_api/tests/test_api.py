@@ -1,6 +1,11 @@
+import subprocess
+import sys
+
 import pytest
 import responses
 from coingecko_api import CoinGeckoAPI
+from coingecko_api.transport import accept_encoding
+from requests import Request
 from requests.exceptions import HTTPError
 
 END_POINTS = 'https://api.coingecko.com/api/v3/'
@@ -99,6 +104,30 @@ def test_close():
         cg.ping()
 
 
+def test_lazy_init():
+    """Test importing the package and creating a client do not load
+    `requests` nor create a session."""
+    code = ('import sys, coingecko_api; cg = coingecko_api.CoinGeckoAPI(); '
+            "assert 'requests' not in sys.modules; "
+            'assert cg._session is None; '
+            'assert coingecko_api.MemoryCache')
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+@responses.activate
+def test_session_on_first_call():
+    """Test the session is created by the first call."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={})
+    cg = CoinGeckoAPI()
+    assert cg._session is None
+    cg.ping()
+    session = cg._session
+    assert session is not None
+    cg.ping()
+    assert cg.session is session
+    cg.close()
+
+
 #
 # simple
 #
@@ -852,3 +881,116 @@ def test_list_companies_holdings():
 
     response = cg.list_companies_holdings(id)
     assert response == resp_json
+
+
+#
+# lean responses
+#
+@responses.activate
+def test_lean():
+    """Test lean presets of heavy methods."""
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/bitcoin',
+                  match=[
+                      responses.matchers.query_param_matcher({
+                          'localization': 'false',
+                          'tickers': 'true',
+                          'community_data': 'false',
+                          'developer_data': 'false',
+                          'sparkline': 'false'
+                      })
+                  ],
+                  json={'id': 'bitcoin'},
+                  status=200)
+
+    cg = CoinGeckoAPI(lean=['get_coin'])
+    # parameters of the call take precedence
+    assert cg.get_coin('bitcoin', {'tickers': 'true'}) == {'id': 'bitcoin'}
+
+
+def test_lean_unknown():
+    """Test lean presets of unknown methods."""
+    with pytest.raises(ValueError, match=r'No lean preset.*'):
+        CoinGeckoAPI(lean=['ping'])
+
+
+def test_fields_unknown():
+    """Test fields of methods without projection."""
+    with pytest.raises(ValueError, match=r'No fields projection.*'):
+        CoinGeckoAPI(fields={'get_simple_price': ['bitcoin']})
+
+
+@responses.activate
+def test_fields():
+    """Test keeping only some fields of the responses."""
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/markets',
+                  json=[{
+                      'id': 'bitcoin',
+                      'symbol': 'btc',
+                      'image': 'https://example.com/btc.png'
+                  }],
+                  status=200)
+
+    cg = CoinGeckoAPI(lean=True,
+                      fields={'list_coins_markets': ['id', 'symbol']})
+    response = cg.list_coins_markets('usd')
+    assert response == [{'id': 'bitcoin', 'symbol': 'btc'}]
+    assert 'sparkline=false' in responses.calls[0].request.url
+
+
+#
+# request preparation
+#
+@pytest.mark.parametrize('path,params', [
+    ('ping', None),
+    ('coins/markets', {
+        'vs_currency': 'usd',
+        'per_page': 250,
+        'category': None
+    }),
+    ('simple/price', {
+        'ids': 'bitcoin,ethereum',
+        'vs_currencies': ['usd', 'jpy'],
+        'include_market_cap': True
+    }),
+    ('search/café coin', {
+        'query': 'a&b=c ~é'
+    }),
+],
+                         ids=['no params', 'none', 'list', 'quoting'])
+def test_prepare(path, params):
+    """Test the fast path prepares the same requests as `requests`."""
+    cg = CoinGeckoAPI(headers={'x-cg-pro-api-key': 'key'}, auth=('u', 'p'))
+    expected = Request(method='GET',
+                       url=cg._ENDPOINT + path,
+                       params=params,
+                       **cg.kwargs).prepare()
+    expected.headers['Accept-Encoding'] = accept_encoding()
+
+    request = cg._prepare('GET', path, params)
+    assert cg._template is not None
+    assert request.url == expected.url
+    assert request.headers == expected.headers
+
+
+def test_prepare_fallback():
+    """Test keyword arguments depending on the call use `requests`."""
+    cg = CoinGeckoAPI(hooks={'response': []})
+    assert cg._prepare('GET', 'ping', None).url == END_POINTS + 'ping'
+    assert cg._template is None
+
+    # kwargs modified after the first call
+    cg.kwargs = {'headers': {'x-cg-pro-api-key': 'key'}}
+    request = cg._prepare('GET', 'ping', None)
+    assert cg._template is not None
+    assert request.headers['x-cg-pro-api-key'] == 'key'
+
+
+def test_prepare_headers_in_place():
+    """Test headers modified in place after the first call are sent."""
+    cg = CoinGeckoAPI(headers={'x-cg-pro-api-key': 'old'})
+    cg._prepare('GET', 'ping', None)
+    cg.kwargs['headers']['x-cg-pro-api-key'] = 'new'
+    request = cg._prepare('GET', 'ping', None)
+    assert request.headers['x-cg-pro-api-key'] == 'new'
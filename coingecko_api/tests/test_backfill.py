@@ -0,0 +1,67 @@
+from datetime import date
+
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.backfill import Backfill, HistoryStore, date_range
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_date_range():
+    """Test generating the days of a range."""
+    assert date_range('30-12-2021', date(2022, 1, 1)) == [
+        date(2021, 12, 30),
+        date(2021, 12, 31),
+        date(2022, 1, 1)
+    ]
+    assert date_range(date(2022, 1, 2), date(2022, 1, 1)) == []
+
+
+def test_history_store(tmp_path):
+    """Test storing the snapshots by id and day."""
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    store.put('bitcoin', '01-01-2022', {'id': 'bitcoin'})
+    store.put('bitcoin', date(2022, 1, 1), {'id': 'bitcoin', 'v': 2})
+
+    assert len(store) == 1
+    assert store.get('bitcoin', date(2022, 1, 1)) == {'id': 'bitcoin', 'v': 2}
+    assert store.get('bitcoin', date(2022, 1, 2)) is None
+    assert store.dates('bitcoin') == {date(2022, 1, 1)}
+    assert store.count('bitcoin', '01-01-2022', date(2022, 1, 2)) == 1
+    assert store.count('bitcoin', date(2022, 1, 2), date(2022, 1, 3)) == 0
+    store.close()
+
+
+@responses.activate
+def test_backfill(tmp_path):
+    """Test skipping stored days and recording failed calls."""
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/bitcoin/history',
+                  json={'id': 'bitcoin'})
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/missing/history',
+                  status=404,
+                  json={'error': 'coin not found'})
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    store.put('bitcoin', date(2022, 1, 1), {'id': 'bitcoin'})
+
+    backfill = Backfill(CoinGeckoAPI(), store, workers=2, progress=False)
+    results = list(
+        backfill.run(['bitcoin', 'missing'], date(2022, 1, 1),
+                     date(2022, 1, 3)))
+
+    assert sorted((id, day) for id, day, _ in results) == [
+        ('bitcoin', date(2022, 1, 2)), ('bitcoin', date(2022, 1, 3))
+    ]
+    assert sorted(backfill.errors) == [('missing', day) for day in date_range(
+        date(2022, 1, 1), date(2022, 1, 3))]
+    assert backfill.progress.done == 6
+    assert store.dates('bitcoin') == set(
+        date_range(date(2022, 1, 1), date(2022, 1, 3)))
+    assert all('date=' in call.request.url for call in responses.calls)
+    assert responses.calls[0].request.url.count('-2022') == 1
+
+    # resuming only retries the failed days
+    assert list(
+        backfill.missing(['bitcoin', 'missing'], date(2022, 1, 1),
+                         date(2022, 1, 3))) == sorted(backfill.errors)
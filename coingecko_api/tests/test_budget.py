@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import pytest
+import responses
+from coingecko_api import (BULK, INTERACTIVE, BudgetExhausted, CoinGeckoAPI,
+                           CreditBudget, DeadlineExceeded, deadline, priority)
+from coingecko_api.budget import month_of
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+# 2022-05-16 00:00 UTC, half of May
+MID_MAY = datetime(2022, 5, 16, tzinfo=timezone.utc).timestamp()
+
+
+def test_month_of():
+    """Test the calendar month of a timestamp."""
+    month, start, end = month_of(MID_MAY)
+    assert month == '2022-05'
+    assert end - start == 31 * 86400
+    assert month_of(datetime(2022, 12, 31, 23,
+                             tzinfo=timezone.utc).timestamp())[0] == '2022-12'
+
+
+def test_usage(tmp_path):
+    """Test the credits per endpoint, key and month."""
+    path = str(tmp_path / 'credits.db')
+    budget = CreditBudget(path, 1000, key='a', costs={'coins/{}/history': 2})
+    for _ in range(3):
+        budget.record('coins/list', now=MID_MAY)
+    budget.record('coins/{}/history', now=MID_MAY)
+    budget.record('coins/list', now=MID_MAY - 31 * 86400)
+    CreditBudget(path, 1000, key='b').record('coins/list', now=MID_MAY)
+
+    # persisted across instances
+    budget = CreditBudget(path, 1000, key='a')
+    assert budget.usage(now=MID_MAY) == {
+        'coins/list': 3,
+        'coins/{}/history': 2
+    }
+    status = budget.status(now=MID_MAY)
+    assert status['used'] == 5
+    assert status['remaining'] == 995
+    assert status['projected'] == pytest.approx(5 * 31 / 15)
+
+
+def test_delay(tmp_path):
+    """Test pacing the throttled classes only."""
+    budget = CreditBudget(str(tmp_path / 'credits.db'),
+                          3100,
+                          reserve=0.1,
+                          burst=0)
+    # 90 credits a day for the throttled classes, 1350 by mid-May
+    for _ in range(1349):
+        budget.record('coins/list', now=MID_MAY)
+    assert budget.delay(BULK, now=MID_MAY) == 0
+    budget.record('coins/list', now=MID_MAY)
+    assert budget.delay(BULK, now=MID_MAY) == pytest.approx(86400 / 90)
+    assert budget.delay(INTERACTIVE, now=MID_MAY) == 0
+
+
+@responses.activate
+def test_client_budget(tmp_path):
+    """Test counting the calls, waiting past the deadline and spending the
+    budget."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={})
+    # 900 credits for the throttled classes, 899 of them used
+    budget = CreditBudget(str(tmp_path / 'credits.db'),
+                          1000,
+                          costs={'coins/list': 898},
+                          burst=0)
+    budget.record('coins/list')
+    cg = CoinGeckoAPI(budget=budget)
+    with priority(INTERACTIVE):
+        cg.ping()
+    assert budget.usage() == {'coins/list': 898, 'ping': 1}
+
+    # far ahead of the schedule
+    with pytest.raises(DeadlineExceeded):
+        with deadline(1):
+            cg.ping()
+    budget.record('ping')
+    with pytest.raises(BudgetExhausted, match=r".*\['interactive'\]"):
+        cg.ping()
+    with priority(INTERACTIVE):
+        cg.ping()
+    assert len(responses.calls) == 2
@@ -0,0 +1,101 @@
+import multiprocessing
+import time
+
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.cache import MemoryCache, SQLiteCache
+from coingecko_api.ratelimit import SQLiteRateLimiter
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_memory_cache():
+    """Test least recently used entries are evicted."""
+    cache = MemoryCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a')[1] == 1
+    assert cache.get('b') is None
+
+
+@responses.activate
+def test_memory_cache_copies():
+    """Test modifying a response does not modify the cached one."""
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/list',
+                  json=[{'id': 'bitcoin'}])
+    cg = CoinGeckoAPI(cache=MemoryCache())
+    cg.list_coins().append({'id': 'injected'})
+    cg.list_coins()[0]['id'] = 'modified'
+
+    assert cg.list_coins() == [{'id': 'bitcoin'}]
+    assert len(responses.calls) == 1
+
+
+def test_sqlite_cache(tmp_path):
+    """Test entries are shared by the caches of the same database."""
+    path = str(tmp_path / 'cache.db')
+    SQLiteCache(path).set('ping', {'gecko_says': '(V3) To the Moon!'})
+
+    cache = SQLiteCache(path)
+    assert cache.get('ping')[1] == {'gecko_says': '(V3) To the Moon!'}
+    assert cache.purge(max_age=60) == 0
+    assert cache.purge(max_age=-1) == 1
+    assert cache.get('ping') is None
+
+
+@responses.activate
+def test_client_cache(tmp_path):
+    """Test fresh responses are served from the cache."""
+    responses.add(responses.GET,
+                  END_POINTS + 'simple/price',
+                  json={'bitcoin': {
+                      'usd': 50087
+                  }})
+    cache = SQLiteCache(str(tmp_path / 'cache.db'))
+    worker_1 = CoinGeckoAPI(cache=cache)
+    worker_2 = CoinGeckoAPI(cache=SQLiteCache(str(tmp_path / 'cache.db')))
+
+    assert worker_1.get_simple_price('bitcoin', 'usd') == {
+        'bitcoin': {
+            'usd': 50087
+        }
+    }
+    assert worker_2.get_simple_price('bitcoin', 'usd') == {
+        'bitcoin': {
+            'usd': 50087
+        }
+    }
+    assert len(responses.calls) == 1
+
+    # stale entries are refreshed
+    worker_2.cache_ttl = 0
+    worker_2.get_simple_price('bitcoin', 'usd')
+    assert len(responses.calls) == 2
+
+
+def _acquire(path, n):
+    limiter = SQLiteRateLimiter(path, 20, period=1)
+    for _ in range(n):
+        limiter.acquire()
+
+
+def test_sqlite_rate_limiter(tmp_path):
+    """Test processes share the same budget."""
+    path = str(tmp_path / 'limits.db')
+    start = time.monotonic()
+    workers = [
+        multiprocessing.Process(target=_acquire, args=(path, 3))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # 6 calls at 20 per second, the first one is free
+    assert time.monotonic() - start >= 0.25
+    assert all(worker.exitcode == 0 for worker in workers)
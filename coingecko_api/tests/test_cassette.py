@@ -0,0 +1,70 @@
+import gzip
+import json
+
+import pytest
+from coingecko_api import CoinGeckoAPI, MemoryCache, OfflineError
+from coingecko_api.cassette import RecordingSession, ReplaySession
+from requests.exceptions import ConnectionError, HTTPError, ReadTimeout
+
+
+def test_record_replay(server, tmp_path):
+    """Test replaying recorded calls without network."""
+    path = str(tmp_path / 'calls.jsonl.gz')
+    cg = CoinGeckoAPI(transport=RecordingSession(path))
+    cg._ENDPOINT = server.endpoint
+    recorded = cg.list_coins_markets('usd', {'page': 2})
+    with pytest.raises(HTTPError):
+        cg._request('missing')
+    cg.close()
+    with gzip.open(path, 'rt') as f:
+        assert [json.loads(line)['status'] for line in f] == [200, 404]
+
+    connections = server.connections
+    cg = CoinGeckoAPI(transport=ReplaySession(path, speed=0))
+    cg._ENDPOINT = server.endpoint
+    # the order of the query parameters does not matter
+    assert cg._request('coins/markets', params={
+        'page': 2,
+        'vs_currency': 'usd'
+    }) == recorded
+    with pytest.raises(HTTPError):
+        cg._request('missing')
+    with pytest.raises(ConnectionError):
+        cg.ping()
+    assert server.connections == connections
+    assert cg.metrics.snapshot()['coins/markets']['calls'] == 1
+
+
+def test_replay_latency(tmp_path):
+    """Test replaying scaled latencies and read timeouts."""
+    path = str(tmp_path / 'calls.jsonl.gz')
+    with gzip.open(path, 'wt') as f:
+        f.write(
+            json.dumps({
+                'method': 'GET',
+                'url': 'https://api.coingecko.com/api/v3/ping',
+                'status': 200,
+                'reason': 'OK',
+                'headers': {},
+                'body': 'e30=',
+                'elapsed': 0.1
+            }) + '\n')
+
+    cg = CoinGeckoAPI(transport=ReplaySession(path, speed=0.5))
+    assert cg.ping() == {}
+    assert cg.metrics.percentile('ping', 0.5) >= 0.05
+    cg = CoinGeckoAPI(timeout=0.01, transport=ReplaySession(path))
+    with pytest.raises(ReadTimeout):
+        cg.ping()
+
+
+def test_offline():
+    """Test serving cached responses only."""
+    cache = MemoryCache()
+    cache.set('GET ping', {'gecko_says': '(V3) To the Moon!'})
+    cg = CoinGeckoAPI(cache=cache, cache_ttl=0, offline=True)
+    assert cg.ping() == {'gecko_says': '(V3) To the Moon!'}
+    with pytest.raises(OfflineError):
+        cg.get_global()
+    with pytest.raises(ValueError):
+        CoinGeckoAPI(offline=True)
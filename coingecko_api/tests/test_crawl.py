@@ -0,0 +1,165 @@
+import json
+
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.__main__ import main
+from coingecko_api.crawl import (Checkpoint, Crawler, Progress, fetch_pages,
+                                  format_seconds, imap_unordered)
+from requests.exceptions import HTTPError
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def _add_listings():
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/list',
+                  json=[{'id': 'bitcoin'}, {'id': 'ethereum'},
+                        {'id': 'tether'}])
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/list',
+                  json=[{'id': 'binance'}])
+
+
+def _read(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_format_seconds():
+    """Test formatting durations."""
+    assert format_seconds(5) == '5s'
+    assert format_seconds(65) == '1m05s'
+    assert format_seconds(3723) == '1h02m03s'
+    assert format_seconds(float('inf')) == '--'
+
+
+def test_progress():
+    """Test throughput and ETA."""
+    progress = Progress('coins', total=10, done=5)
+    assert progress.eta == float('inf')
+    progress.update(5)
+    assert progress.eta == 0
+    assert progress.render().startswith('coins: 10/10 (100.0%)')
+
+
+@responses.activate
+def test_crawl(tmp_path):
+    """Test crawling all stages."""
+    _add_listings()
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/markets',
+                  json=[{'id': 'bitcoin'}, {'id': 'ethereum'}])
+    for id in ('bitcoin', 'ethereum', 'tether'):
+        responses.add(responses.GET, END_POINTS + f'coins/{id}', json={'id': id})
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/binance/tickers',
+                  json={'tickers': [{'base': 'BTC'}]})
+
+    Crawler(CoinGeckoAPI(), str(tmp_path), workers=2, progress=False).run()
+
+    assert [r['key'] for r in _read(tmp_path / 'markets.jsonl')
+            ] == ['bitcoin', 'ethereum']
+    assert sorted(r['key'] for r in _read(tmp_path / 'coins.jsonl')) == [
+        'bitcoin', 'ethereum', 'tether'
+    ]
+    assert _read(tmp_path / 'tickers.jsonl')[0]['data'] == {'base': 'BTC'}
+    state = Checkpoint(str(tmp_path / 'checkpoint.json')).state
+    assert all(stage['complete'] for stage in state['stages'].values())
+
+
+@responses.activate
+def test_crawl_resume(tmp_path):
+    """Test resuming an interrupted crawl without duplicates."""
+    _add_listings()
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/bitcoin',
+                  json={'id': 'bitcoin'})
+    responses.add(responses.GET, END_POINTS + 'coins/ethereum', status=500)
+    crawler = Crawler(CoinGeckoAPI(),
+                      str(tmp_path),
+                      retries=0,
+                      commit_interval=0,
+                      progress=False)
+    with pytest.raises(HTTPError):
+        crawler.run(['coins'])
+
+    responses.replace(responses.GET,
+                      END_POINTS + 'coins/ethereum',
+                      json={'id': 'ethereum'})
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/tether',
+                  json={'id': 'tether'})
+    Crawler(CoinGeckoAPI(), str(tmp_path), progress=False).run(['coins'])
+
+    assert [r['key'] for r in _read(tmp_path / 'coins.jsonl')
+            ] == ['bitcoin', 'ethereum', 'tether']
+    # listing and completed coins are not requested again
+    assert len([
+        call for call in responses.calls
+        if call.request.url.endswith('coins/bitcoin')
+    ]) == 1
+    assert len([
+        call for call in responses.calls
+        if call.request.url.endswith('coins/list')
+    ]) == 1
+
+
+@responses.activate
+def test_crawl_retry(tmp_path):
+    """Test retrying rate limited calls."""
+    _add_listings()
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/binance/tickers',
+                  status=429,
+                  headers={'Retry-After': '0'})
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/binance/tickers',
+                  json={'tickers': []})
+
+    Crawler(CoinGeckoAPI(), str(tmp_path), progress=False).run(['tickers'])
+    assert _read(tmp_path / 'tickers.jsonl') == []
+
+
+def test_crawl_invalid(tmp_path):
+    """Test invalid format and stages."""
+    with pytest.raises(ValueError):
+        Crawler(CoinGeckoAPI(), str(tmp_path), format='csv')
+    with pytest.raises(ValueError):
+        Crawler(CoinGeckoAPI(), str(tmp_path)).run(['events'])
+
+
+@responses.activate
+def test_cli(tmp_path):
+    """Test `python -m coingecko_api crawl`."""
+    _add_listings()
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/binance/tickers',
+                  json={'tickers': []})
+
+    main(['crawl', str(tmp_path), '--stages', 'tickers', '--rate', '600',
+          '--quiet'])
+    assert (tmp_path / 'checkpoint.json').exists()
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_imap_unordered(workers):
+    """Test failed calls are raised or returned."""
+
+    def func(n):
+        if n == 3:
+            raise ValueError(n)
+        return n * 2
+
+    with pytest.raises(ValueError):
+        dict(imap_unordered(func, range(10), workers))
+    results = dict(imap_unordered(func, range(10), workers,
+                                  return_exceptions=True))
+    assert isinstance(results.pop(3), ValueError)
+    assert results == {n: n * 2 for n in range(10) if n != 3}
+
+
+def test_fetch_pages():
+    """Test pages are fetched until one is not full."""
+    pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+    assert fetch_pages(pages.get, 2) == [1, 2, 3, 4, 5]
@@ -0,0 +1,115 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+import responses
+from coingecko_api import (CoinGeckoAPI, DeadlineExceeded, bound_timeout,
+                           deadline, remaining)
+from coingecko_api.crawl import call_with_retry
+from coingecko_api.ratelimit import (BULK, INTERACTIVE, PriorityScheduler,
+                                     RateLimiter)
+from requests.exceptions import Timeout
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_deadline():
+    """Test nested deadlines."""
+    assert remaining() is None
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert bound_timeout((3.05, 27)) <= (1, 1)
+            assert bound_timeout(None) <= 1
+    assert bound_timeout((3.05, 27)) == (3.05, 27)
+
+
+def test_deadline_exceeded():
+    """Test calls are not sent past the deadline."""
+    cg = CoinGeckoAPI()
+    with deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            cg.ping()
+
+
+@responses.activate
+def test_split_timeout():
+    """Test connect and read timeouts are capped by the deadline."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={})
+    cg = CoinGeckoAPI(timeout=(3.05, 27))
+    with mock.patch.object(cg.session, 'send',
+                           wraps=cg.session.send) as send:
+        cg.ping()
+        assert send.call_args.kwargs['timeout'] == (3.05, 27)
+        with deadline(5):
+            cg.ping()
+        connect, read = send.call_args.kwargs['timeout']
+        assert connect == 3.05
+        assert read <= 5
+
+
+def test_read_timeout_past_deadline():
+    """Test timeouts caused by the deadline."""
+    cg = CoinGeckoAPI()
+
+    def send(*args, **kwargs):
+        time.sleep(0.02)
+        raise Timeout()
+
+    with mock.patch.object(cg.session, 'send', side_effect=send):
+        with deadline(0.01):
+            with pytest.raises(DeadlineExceeded):
+                cg.ping()
+
+
+@responses.activate
+def test_retry_within_deadline():
+    """Test retries are abandoned when the deadline would pass."""
+    responses.add(responses.GET, END_POINTS + 'ping', status=503)
+    cg = CoinGeckoAPI()
+
+    start = time.monotonic()
+    with deadline(0.5):
+        with pytest.raises(DeadlineExceeded):
+            call_with_retry(cg.ping, backoff=1)
+    assert time.monotonic() - start < 0.5
+
+
+@responses.activate
+def test_rate_limiter_wait():
+    """Test waits of the rate limiter stop at the deadline."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={})
+    for limiter in (RateLimiter(1, period=5),
+                    PriorityScheduler(RateLimiter(1, period=5))):
+        cg = CoinGeckoAPI(limiter=limiter)
+        cg.ping()
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded), deadline(0.5):
+            cg.ping()
+        assert time.monotonic() - start < 0.1
+
+
+def test_scheduler_queue_wait():
+    """Test calls queued behind others stop waiting at the deadline."""
+    scheduler = PriorityScheduler(RateLimiter(1, period=0.6))
+    scheduler.acquire()
+    # an interactive call is dispatched first
+    thread = threading.Thread(target=scheduler.acquire, args=(INTERACTIVE, ))
+    thread.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded), deadline(0.3):
+        scheduler.acquire(BULK)
+    assert 0.25 < time.monotonic() - start < 0.5
+    thread.join()
+
+
+def test_module():
+    """Test the `deadline` function does not shadow its module."""
+    import coingecko_api
+    import coingecko_api._deadline as module
+    assert coingecko_api.deadline is module.deadline
+    assert module.remaining is remaining
@@ -0,0 +1,81 @@
+import math
+
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.derivatives import (DerivativesCollector, DerivativesStore,
+                                       to_columns)
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def _ticker(market, symbol, funding_rate, price='100.5'):
+    return {
+        'market': market,
+        'symbol': symbol,
+        'price': price,
+        'funding_rate': funding_rate,
+        'open_interest': 1e6,
+        'basis': None,
+        'last_traded_at': 1650000000
+    }
+
+
+def test_to_columns():
+    """Test the columns of a snapshot."""
+    snapshot = to_columns([
+        _ticker('Binance', 'BTCUSDT', 0.01),
+        _ticker('Binance', 'ETHUSDT', 0.02, price=''),
+        {'symbol': 'NOMARKET'}
+    ], timestamp=1000)
+
+    assert snapshot.contracts == [('Binance', 'BTCUSDT'),
+                                  ('Binance', 'ETHUSDT')]
+    assert snapshot.contracts[0][0] is snapshot.contracts[1][0]
+    assert list(snapshot.columns['price'])[0] == 100.5
+    assert math.isnan(snapshot.columns['price'][1])
+    assert math.isnan(snapshot.columns['basis'][0])
+    assert list(snapshot.last_traded_at) == [1650000000] * 2
+
+
+@responses.activate
+def test_collect(tmp_path):
+    """Test appending snapshots and reading the history of a contract."""
+    for rate in (0.01, 0.02):
+        responses.add(responses.GET,
+                      END_POINTS + 'derivatives',
+                      json=[
+                          _ticker('Binance', 'BTCUSDT', rate),
+                          _ticker('FTX', 'BTC-PERP', -rate)
+                      ])
+    path = str(tmp_path / 'derivatives.db')
+    collector = DerivativesCollector(CoinGeckoAPI(), DerivativesStore(path))
+    collector.collect(timestamp=1000)
+    snapshot = collector.collect(timestamp=2000)
+    assert collector.store.append(snapshot) == 0
+    collector.store.close()
+
+    store = DerivativesStore(path)
+    assert sorted(store.contracts()) == [('Binance', 'BTCUSDT'),
+                                         ('FTX', 'BTC-PERP')]
+    history = store.history('FTX', 'BTC-PERP')
+    assert list(history['timestamp']) == [1000, 2000]
+    assert list(history['funding_rate']) == [-0.01, -0.02]
+    assert math.isnan(history['basis'][0])
+    assert list(store.history('FTX', 'BTC-PERP', 1500)['timestamp']) == [2000]
+    assert len(store.history('FTX', 'ETH-PERP')['timestamp']) == 0
+
+
+def test_shared_store(tmp_path):
+    """Test contracts added by another connection are read."""
+    path = str(tmp_path / 'deriv.db')
+    reader = DerivativesStore(path)
+    writer = DerivativesStore(path)
+    writer.append(to_columns([_ticker('Binance', 'BTCUSDT', 0.01)], 1000))
+
+    assert reader.contracts() == [('Binance', 'BTCUSDT')]
+    assert list(reader.history('Binance', 'BTCUSDT')['timestamp']) == [1000]
+    assert reader.append(
+        to_columns([_ticker('Binance', 'BTCUSDT', 0.02)], 2000)) == 1
+    assert len(writer.history('Binance', 'BTCUSDT')['timestamp']) == 2
+    reader.close()
+    writer.close()
@@ -0,0 +1,65 @@
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.diff import ChangeDetector, record_hash
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_record_hash():
+    """Test hashing records regardless of the order of their keys."""
+    assert record_hash({'id': 'a', 'name': 'A'}) == \
+        record_hash({'name': 'A', 'id': 'a'})
+    assert record_hash({'id': 'a'}) != record_hash({'id': 'b'})
+
+
+@responses.activate
+def test_diff(tmp_path, monkeypatch):
+    """Test added, removed and changed records across polls."""
+    path = str(tmp_path / 'lists.json')
+    first = [{'id': 'bitcoin', 'name': 'Bitcoin'}, {'id': 'dogecoin'}]
+    second = [{'id': 'bitcoin', 'name': 'BTC'}, {'id': 'ethereum'}]
+    for body in (first, first, first, second):
+        responses.add(responses.GET, END_POINTS + 'coins/list', json=body)
+
+    detector = ChangeDetector(CoinGeckoAPI(), path)
+    changes = detector.diff('coins')
+    assert sorted(changes.added) == ['bitcoin', 'dogecoin']
+    assert not changes.removed and not changes.changed
+
+    # unchanged bodies are not decoded
+    calls = []
+    monkeypatch.setattr(detector.cg, '_process_response', calls.append)
+    unchanged = detector.diff('coins')
+    assert unchanged.empty
+    assert calls == []
+    # results are not shared
+    unchanged.added['x'] = {}
+    assert detector.diff('coins').empty
+    monkeypatch.undo()
+
+    # snapshots are kept across runs
+    changes = ChangeDetector(CoinGeckoAPI(), path).diff('coins')
+    assert changes.added == {'ethereum': {'id': 'ethereum'}}
+    assert changes.removed == {'dogecoin': {'id': 'dogecoin'}}
+    assert changes.changed == {
+        'bitcoin': ({
+            'id': 'bitcoin',
+            'name': 'Bitcoin'
+        }, {
+            'id': 'bitcoin',
+            'name': 'BTC'
+        })
+    }
+
+
+@responses.activate
+def test_diff_categories():
+    """Test the key of the categories and unknown lists."""
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/categories/list',
+                  json=[{'category_id': 'defi', 'name': 'DeFi'}])
+    detector = ChangeDetector(CoinGeckoAPI())
+    assert list(detector.diff('categories').added) == ['defi']
+    with pytest.raises(ValueError):
+        detector.diff('tickers')
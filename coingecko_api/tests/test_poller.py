@@ -0,0 +1,62 @@
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.poller import AdaptiveInterval, Poller
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_adaptive_interval():
+    """Test the interval within its bounds."""
+    interval = AdaptiveInterval(10, 40, speedup=0.5, slowdown=2)
+    assert interval.update(False) == 20
+    assert interval.update(False) == 40
+    assert interval.update(False) == 40
+    assert interval.update(True) == 20
+    assert interval.update(True) == 10
+    assert interval.update(True) == 10
+    with pytest.raises(ValueError):
+        AdaptiveInterval(10, 5)
+
+
+@responses.activate
+def test_poller():
+    """Test polling the due targets and adapting their intervals."""
+    for body in ({'v': 1}, {'v': 1}, {'v': 2}):
+        responses.add(responses.GET, END_POINTS + 'global', json=body)
+    responses.add(responses.GET, END_POINTS + 'search/trending', status=500)
+
+    poller = Poller(CoinGeckoAPI(), ['get_global', 'get_search_trending'],
+                    min_interval=10,
+                    max_interval=100)
+    assert poller.poll(now=0) == [('get_global', {'v': 1})]
+    assert poller.targets['get_search_trending'].error is not None
+    assert poller.next_poll() == 10
+
+    assert poller.poll(now=5) == []
+    assert poller.poll(now=10) == []
+    assert poller.targets['get_global'].interval.value == 12
+    assert poller.poll(now=22) == [('get_global', {'v': 2})]
+
+    stats = poller.stats()['get_global']
+    assert stats['polls'] == 2 and stats['changes'] == 1
+    assert stats['interval'] == 10
+    assert len(responses.calls) == 6
+
+
+@responses.activate
+def test_poller_same_method():
+    """Test polling one method with different arguments."""
+    for id in ('bitcoin', 'ethereum'):
+        responses.add(responses.GET,
+                      END_POINTS + f'coins/{id}/tickers',
+                      json={'name': id})
+
+    poller = Poller(CoinGeckoAPI(), [])
+    poller.add('get_coin_tickers', 'bitcoin')
+    poller.add('get_coin_tickers', 'ethereum', key='eth')
+    assert set(poller.targets) == {"get_coin_tickers('bitcoin')", 'eth'}
+    assert poller.poll(now=0) == [
+        ("get_coin_tickers('bitcoin')", {'name': 'bitcoin'}),
+        ('eth', {'name': 'ethereum'})
+    ]
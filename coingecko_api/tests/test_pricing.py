@@ -0,0 +1,132 @@
+import json
+
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.pricing import ExchangeRates, Pricer, get_token_prices
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+rates_json = {
+    'rates': {
+        'btc': {
+            'name': 'Bitcoin',
+            'unit': 'BTC',
+            'value': 1.0,
+            'type': 'crypto'
+        },
+        'usd': {
+            'name': 'US Dollar',
+            'unit': '$',
+            'value': 50000.0,
+            'type': 'fiat'
+        },
+        'eur': {
+            'name': 'Euro',
+            'unit': '€',
+            'value': 40000.0,
+            'type': 'fiat'
+        }
+    }
+}
+
+
+@responses.activate
+def test_exchange_rates():
+    """Test rates are cached."""
+    responses.add(responses.GET, END_POINTS + 'exchange_rates', json=rates_json)
+    rates = ExchangeRates(CoinGeckoAPI(), max_age=60)
+
+    assert rates.factors('usd', ['eur', 'btc', 'xyz']) == {
+        'eur': 0.8,
+        'btc': 1 / 50000
+    }
+    rates.values()
+    assert len(responses.calls) == 1
+    with pytest.raises(ValueError):
+        rates.factors('xyz', ['eur'])
+
+
+@responses.activate
+def test_pricer():
+    """Test prices converted from the anchor currency."""
+    responses.add(responses.GET, END_POINTS + 'exchange_rates', json=rates_json)
+    responses.add(responses.GET,
+                  END_POINTS + 'simple/price',
+                  match=[
+                      responses.matchers.query_param_matcher({
+                          'ids': 'bitcoin,ethereum',
+                          'vs_currencies': 'usd',
+                          'include_market_cap': 'true'
+                      })
+                  ],
+                  json={
+                      'bitcoin': {
+                          'usd': 50000,
+                          'usd_market_cap': 1e12
+                      },
+                      'ethereum': {
+                          'usd': 4000,
+                          'usd_market_cap': 5e11
+                      }
+                  })
+    responses.add(responses.GET,
+                  END_POINTS + 'simple/price',
+                  match=[
+                      responses.matchers.query_param_matcher({
+                          'ids': 'bitcoin,ethereum',
+                          'vs_currencies': 'jpy',
+                          'include_market_cap': 'true'
+                      })
+                  ],
+                  json={
+                      'bitcoin': {
+                          'jpy': 5500000
+                      },
+                      'ethereum': {
+                          'jpy': 440000
+                      }
+                  })
+
+    pricer = Pricer(CoinGeckoAPI())
+    response = pricer.get_simple_price(['bitcoin', 'ethereum'],
+                                       ['eur', 'jpy'],
+                                       {'include_market_cap': 'true'})
+
+    assert response['bitcoin'] == {
+        'eur': 40000,
+        'eur_market_cap': 8e11,
+        'jpy': 5500000
+    }
+    assert response['ethereum']['eur'] == 3200
+
+
+@responses.activate
+def test_get_token_prices():
+    """Test batching the tokens of many platforms."""
+
+    def callback(request):
+        addresses = request.params['contract_addresses'].split(',')
+        return 200, {}, json.dumps({a: {'usd': 1.0} for a in addresses})
+
+    for platform in ('ethereum', 'polygon-pos'):
+        responses.add_callback(responses.GET,
+                               END_POINTS + f'simple/token_price/{platform}',
+                               callback=callback)
+
+    eth = [f'0x{i:040x}' for i in range(6)]
+    tokens = [('ethereum', a.upper()) for a in eth] + [
+        ('polygon-pos', eth[0]), ('ethereum', eth[0])
+    ]
+    url = (END_POINTS + 'simple/token_price/ethereum?'
+           'contract_addresses=&vs_currencies=usd')
+    # room for 3 addresses per call
+    prices = get_token_prices(CoinGeckoAPI(),
+                              tokens,
+                              'usd',
+                              max_url_length=len(url) + 3 * 42 + 2 * 3)
+
+    assert len(prices) == 7
+    assert prices[('polygon-pos', eth[0])] == {'usd': 1.0}
+    assert len(responses.calls) == 3
+    assert get_token_prices(CoinGeckoAPI(), [], 'usd') == {}
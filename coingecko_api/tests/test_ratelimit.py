@@ -0,0 +1,97 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.ratelimit import (BULK, INTERACTIVE, PriorityScheduler,
+                                     RateLimiter, priority)
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_invalid_rate():
+    """Test invalid limits."""
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_acquire():
+    """Test calls are spread over the period."""
+    limiter = RateLimiter(20, period=1)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+
+    # the first token is available immediately
+    assert time.monotonic() - start >= 0.1
+    assert limiter.try_acquire() > 0
+
+
+def _dispatch(scheduler, calls):
+    """Start the calls in order and return the order they were dispatched."""
+    order = []
+    lock = threading.Lock()
+
+    def call(name):
+        scheduler.acquire(name)
+        with lock:
+            order.append(name)
+
+    threads = []
+    for name in calls:
+        thread = threading.Thread(target=call, args=(name, ))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_priority_scheduler():
+    """Test interactive calls jump ahead of queued bulk calls."""
+    scheduler = PriorityScheduler(RateLimiter(20, period=1))
+    order = _dispatch(scheduler, [BULK] * 4 + [INTERACTIVE])
+
+    # the first bulk call is dispatched before the interactive one arrives
+    assert order.index(INTERACTIVE) <= 1
+
+
+def test_priority_scheduler_min_share():
+    """Test bulk calls get their minimum share."""
+    scheduler = PriorityScheduler(RateLimiter(20, period=1),
+                                  min_share={BULK: 0.5},
+                                  window=4)
+    order = _dispatch(scheduler, [INTERACTIVE] + [BULK] + [INTERACTIVE] * 4)
+
+    assert order.index(BULK) <= 2
+
+
+def test_invalid_priority():
+    """Test unknown priority classes."""
+    with pytest.raises(ValueError):
+        PriorityScheduler(RateLimiter(1), min_share={'urgent': 0.1})
+    with pytest.raises(ValueError):
+        PriorityScheduler(RateLimiter(1)).acquire('urgent')
+    with pytest.raises(ValueError):
+        with priority('urgent'):
+            pass
+    with pytest.raises(ValueError):
+        CoinGeckoAPI(priority='Bulk')
+
+
+@responses.activate
+def test_client_priority():
+    """Test the priority class of the calls of a client."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={})
+    limiter = mock.Mock()
+    cg = CoinGeckoAPI(limiter=limiter, priority=BULK)
+
+    cg.ping()
+    with priority(INTERACTIVE):
+        cg.ping()
+
+    assert [c.args for c in limiter.acquire.call_args_list
+            ] == [(BULK, ), (INTERACTIVE, )]
@@ -0,0 +1,172 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import responses
+from coingecko_api import (CoinGeckoAPI, DeadlineExceeded, MemoryCache,
+                           deadline)
+from coingecko_api.metrics import Metrics, endpoint_of
+from coingecko_api.resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker,
+                                      CircuitOpenError, Hedging)
+from coingecko_api.ratelimit import RateLimiter
+from requests.exceptions import ConnectionError, HTTPError
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def test_endpoint_of():
+    """Test parameters are removed from the paths."""
+    assert endpoint_of('coins/bitcoin/tickers') == 'coins/{}/tickers'
+    assert endpoint_of('coins/list') == 'coins/list'
+
+
+def test_metrics():
+    """Test latency percentiles."""
+    metrics = Metrics(window=10)
+    for latency in range(20):
+        metrics.record('ping', latency)
+
+    assert metrics.percentile('ping', 0.5) == 15
+    assert metrics.percentile('ping', 0.5, min_samples=11) is None
+    assert metrics.snapshot()['ping']['calls'] == 20
+
+
+def test_circuit_breaker():
+    """Test opening, half opening and closing a circuit."""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure('ping')
+    breaker.allow('ping')
+    breaker.record_failure('ping')
+    assert breaker.state('ping') == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow('ping')
+
+    time.sleep(0.05)
+    breaker.allow('ping')
+    assert breaker.state('ping') == HALF_OPEN
+    # a single trial call is let through
+    with pytest.raises(CircuitOpenError):
+        breaker.allow('ping')
+    breaker.record_success('ping')
+    assert breaker.state('ping') == CLOSED
+
+
+@responses.activate
+def test_interrupted_trial():
+    """Test a trial call interrupted by a deadline is replaced."""
+    responses.add(responses.GET, END_POINTS + 'ping', status=503)
+    responses.add(responses.GET, END_POINTS + 'ping', json={'ok': 1})
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    cg = CoinGeckoAPI(breaker=breaker)
+    with pytest.raises(HTTPError):
+        cg.ping()
+
+    time.sleep(0.05)
+    with pytest.raises(DeadlineExceeded), deadline(0):
+        cg.ping()
+    assert breaker.state('ping') == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        cg.ping()
+
+    time.sleep(0.05)
+    assert cg.ping() == {'ok': 1}
+    assert breaker.state('ping') == CLOSED
+
+
+@responses.activate
+def test_client_circuit_breaker():
+    """Test failing endpoints fail fast or serve stale responses."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={'ok': 1})
+    responses.add(responses.GET, END_POINTS + 'ping', status=503)
+    cg = CoinGeckoAPI(cache=MemoryCache(),
+                      cache_ttl=0,
+                      breaker=CircuitBreaker(failure_threshold=1))
+
+    assert cg.ping() == {'ok': 1}
+    with pytest.raises(HTTPError):
+        cg.ping()
+    assert cg.ping() == {'ok': 1}
+    assert len(responses.calls) == 2
+
+    cg.cache.clear()
+    with pytest.raises(CircuitOpenError):
+        cg.ping()
+
+
+@responses.activate
+def test_hedging():
+    """Test a duplicate of a stalled call answers for it."""
+    calls = []
+
+    def callback(request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            return ConnectionError('stalled')
+        return 200, {}, '{"ok": 1}'
+
+    responses.add_callback(responses.GET, END_POINTS + 'ping', callback)
+    cg = CoinGeckoAPI(hedging=Hedging(percentile=0.5, min_samples=1))
+    cg.metrics.record('ping', 0.01)
+
+    assert cg.ping() == {'ok': 1}
+    assert len(calls) == 2
+    assert cg.metrics.snapshot()['ping']['hedges'] == 1
+
+    # no duplicate of a call answering in time
+    cg.metrics.record('ping', 1)
+    cg.metrics.record('ping', 1)
+    assert cg.ping() == {'ok': 1}
+    assert len(calls) == 3
+    cg.close()
+
+
+@responses.activate
+def test_hedging_concurrency():
+    """Test the pool of the duplicates does not limit the calls."""
+
+    def callback(request):
+        time.sleep(0.2)
+        return 200, {}, '{"ok": 1}'
+
+    responses.add_callback(responses.GET, END_POINTS + 'ping', callback)
+    cg = CoinGeckoAPI(hedging=Hedging(min_samples=1, max_workers=1))
+    cg.metrics.record('ping', 10)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(8) as pool:
+        assert list(pool.map(lambda _: cg.ping(), range(8))) == [{'ok': 1}] * 8
+    assert time.monotonic() - start < 0.5
+    assert cg.metrics.snapshot()['ping']['hedges'] == 0
+    cg.close()
+
+
+@responses.activate
+def test_hedging_deadline():
+    """Test duplicates keep the deadline of the caller."""
+    responses.add(responses.GET, END_POINTS + 'ping', json={'ok': 1})
+    limiter = RateLimiter(1, period=5)
+    cg = CoinGeckoAPI(limiter=limiter,
+                      hedging=Hedging(percentile=0.5, min_samples=1))
+    cg.metrics.record('ping', 0.01)
+    cg.ping()
+    # the duplicate needs a token the deadline does not leave time for
+    responses.reset()
+
+    def callback(request):
+        time.sleep(0.1)
+        return ConnectionError('stalled')
+
+    responses.add_callback(responses.GET, END_POINTS + 'ping', callback)
+    limiter._tokens = 1
+    start = time.monotonic()
+    with pytest.raises(ConnectionError), deadline(1):
+        cg.ping()
+    assert time.monotonic() - start < 1
+    cg.close()
+
+
+def test_invalid_hedging():
+    """Test invalid percentiles."""
+    with pytest.raises(ValueError):
+        Hedging(percentile=1)
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+from coingecko_api.series import (SeriesWriter, chart_columns, open_series,
+                                  save_chart, save_ohlc)
+
+chart = {
+    'prices': [[1000, 10.0], [2000, 11.0], [3000, 12.0]],
+    'market_caps': [[1000, 100.0], [2000, 110.0], [3000, 120.0]],
+    'total_volumes': [[1000, 5.0], [3000, 6.0]]
+}
+
+
+def test_chart_columns():
+    """Test missing values are NaN."""
+    columns = chart_columns(chart)
+    assert columns['timestamp'] == [1000, 2000, 3000]
+    assert math.isnan(columns['total_volume'][1])
+
+
+def test_save_chart(tmp_path):
+    """Test appending overlapping charts."""
+    path = str(tmp_path / 'bitcoin-usd')
+    assert save_chart(path, chart) == 3
+    overlap = {
+        'prices': [[3000, 12.0], [4000, 13.0]],
+        'market_caps': [[3000, 120.0], [4000, 130.0]],
+        'total_volumes': [[3000, 6.0], [4000, 7.0]]
+    }
+    assert save_chart(path, overlap) == 1
+
+    with open_series(path) as series:
+        assert len(series) == 4
+        assert series['timestamp'].tolist() == [1000, 2000, 3000, 4000]
+        assert series['price'].tolist() == [10.0, 11.0, 12.0, 13.0]
+        assert series.range(2000, 3500) == (1, 3)
+        assert series.columns == ['price', 'market_cap', 'total_volume']
+
+
+def test_uncommitted_rows(tmp_path):
+    """Test values of an interrupted append are dropped."""
+    path = str(tmp_path / 'bitcoin-usd')
+    save_chart(path, chart)
+    with open(tmp_path / 'bitcoin-usd' / 'price.bin', 'ab') as f:
+        f.write(b'\0' * 8)
+
+    with open_series(path) as series:
+        assert len(series['price']) == 3
+    with SeriesWriter(path) as writer:
+        assert writer.last_timestamp == 3000
+    assert (tmp_path / 'bitcoin-usd' / 'price.bin').stat().st_size == 24
+
+
+def test_failed_append(tmp_path):
+    """Test a failed append writes nothing."""
+    path = str(tmp_path / 'bitcoin-usd')
+    with SeriesWriter(path) as writer:
+        writer.append(chart_columns(chart))
+        with pytest.raises(ValueError):
+            writer.append({'timestamp': [4000, 5000],
+                           'price': [1.0, 2.0],
+                           'market_cap': [1.0, 2.0],
+                           'total_volume': [1.0]})
+        with pytest.raises(TypeError):
+            writer.append({'timestamp': [4000],
+                           'price': [1.0],
+                           'market_cap': [1.0],
+                           'total_volume': ['x']})
+        writer.append({'timestamp': [4000],
+                       'price': [13.0],
+                       'market_cap': [130.0],
+                       'total_volume': [7.0]})
+
+    with open_series(path) as series:
+        assert series['timestamp'].tolist() == [1000, 2000, 3000, 4000]
+        assert series['total_volume'].tolist()[3] == 7.0
+    assert (tmp_path / 'bitcoin-usd' / 'price.bin').stat().st_size == 32
+
+
+def test_save_ohlc(tmp_path):
+    """Test OHLC series."""
+    path = str(tmp_path / 'bitcoin-usd-ohlc')
+    save_ohlc(path, [[1000, 1.0, 2.0, 0.5, 1.5]])
+    with open_series(path) as series:
+        assert series['high'].tolist() == [2.0]
+
+
+def test_empty_series(tmp_path):
+    """Test reading and appending invalid columns."""
+    path = str(tmp_path / 'empty')
+    with SeriesWriter(path) as writer:
+        with pytest.raises(ValueError):
+            writer.append({'timestamp': [1]})
+    with open_series(path) as series:
+        assert len(series['price']) == 0
@@ -0,0 +1,54 @@
+import gzip
+import hashlib
+import io
+import json
+
+import pytest
+import responses
+from responses import matchers
+from coingecko_api import CoinGeckoAPI, stream_to
+from requests.exceptions import HTTPError
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+@responses.activate
+def test_stream_to_file(tmp_path):
+    """Test writing a compressed body to a file."""
+    body = json.dumps([{'id': f'coin{i}'} for i in range(10000)]).encode()
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/list',
+                  body=body,
+                  match=[
+                      matchers.query_param_matcher(
+                          {'include_platform': 'true'})
+                  ])
+
+    path = tmp_path / 'coins.json.gz'
+    with stream_to(str(path), compress='gzip', chunk_size=1024):
+        result = CoinGeckoAPI().list_coins({'include_platform': 'true'})
+
+    assert result.status == 200
+    assert result.size == len(body)
+    assert result.sha256 == hashlib.sha256(body).hexdigest()
+    with gzip.open(path) as f:
+        assert f.read() == body
+
+
+def test_stream_to_file_object(server):
+    """Test writing bodies to a file-like object."""
+    cg = CoinGeckoAPI()
+    cg._ENDPOINT = server.endpoint
+    sink = io.BytesIO()
+    with stream_to(sink):
+        cg.ping()
+        cg.get_global()
+        with pytest.raises(HTTPError):
+            cg._request('missing')
+    assert sink.getvalue() == b'{"path": "/ping"}{"path": "/global"}'
+
+    # outside of the block, responses are decoded
+    assert cg.ping() == {'path': '/ping'}
+    with pytest.raises(ValueError):
+        with stream_to(sink, compress='zip'):
+            pass
@@ -0,0 +1,73 @@
+import pytest
+import responses
+from coingecko_api import CoinGeckoAPI
+from coingecko_api.tickers import TickerIndex
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def _ticker(base, target, volume, spread=0.1, **kwargs):
+    return dict(base=base,
+                target=target,
+                last=1.0,
+                volume=volume,
+                bid_ask_spread_percentage=spread,
+                **kwargs)
+
+
+@responses.activate
+def test_ticker_index():
+    """Test fetching every page of every exchange."""
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/list',
+                  json=[{'id': 'binance'}, {'id': 'kraken'}])
+    responses.add(
+        responses.GET,
+        END_POINTS + 'exchanges/binance/tickers',
+        match=[responses.matchers.query_param_matcher({'page': '1'})],
+        json={'tickers': [_ticker('ETH', 'USDT', 1)] * 99 +
+              [_ticker('BTC', 'USDT', 10, 0.2)]})
+    responses.add(
+        responses.GET,
+        END_POINTS + 'exchanges/binance/tickers',
+        match=[responses.matchers.query_param_matcher({'page': '2'})],
+        json={'tickers': [_ticker('SOL', 'USDT', 3, is_stale=True)]})
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/kraken/tickers',
+                  json={'tickers': [_ticker('BTC', 'USDT', 5, 0.05)]})
+
+    index = TickerIndex(CoinGeckoAPI(), workers=2)
+    assert index.refresh() == 2
+    assert set(index.get('btc', 'usdt')) == {'binance', 'kraken'}
+    assert index.best('BTC', 'USDT').exchange == 'binance'
+    assert index.best('BTC', 'USDT', by='spread').exchange == 'kraken'
+    assert index.get('SOL', 'USDT') == {}
+    assert len(index) == 2
+
+    # fresh exchanges are not fetched again
+    assert index.refresh() == 0
+    with pytest.raises(ValueError):
+        index.best('BTC', 'USDT', by='price')
+
+
+def test_update():
+    """Test quotes of an exchange are replaced."""
+    index = TickerIndex(CoinGeckoAPI())
+    index.update('kraken', [_ticker('BTC', 'USD', 1), _ticker('ETH', 'USD', 1)])
+    index.update('kraken', [_ticker('BTC', 'USD', 2)])
+
+    assert index.get('BTC', 'USD')['kraken'].volume == 2
+    assert index.get('ETH', 'USD') == {}
+    assert index.best('ETH', 'USD') is None
+
+
+@responses.activate
+def test_refresh_errors():
+    """Test failing exchanges are reported."""
+    responses.add(responses.GET,
+                  END_POINTS + 'exchanges/ftx/tickers',
+                  status=404)
+
+    index = TickerIndex(CoinGeckoAPI())
+    assert index.refresh(['ftx']) == 0
+    assert 'ftx' in index.errors
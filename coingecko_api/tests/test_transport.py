@@ -0,0 +1,135 @@
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from coingecko_api import CoinGeckoAPI, stream_to
+from requests.exceptions import ConnectionError, HTTPError
+
+
+def _client(server, **kwargs):
+    cg = CoinGeckoAPI(**kwargs)
+    cg._ENDPOINT = server.endpoint
+    return cg
+
+
+def test_connection_reuse(server):
+    """Test connection reuse is recorded in the metrics."""
+    cg = _client(server)
+    for _ in range(3):
+        assert cg.ping() == {'path': '/ping'}
+
+    assert cg.metrics.connections == {'new': 1, 'reused': 2}
+    assert cg.metrics.http_versions == {'HTTP/1.1': 3}
+    assert server.connections == 1
+    cg.close()
+
+
+def test_http2_fallback(server):
+    """Test the HTTP/2 transport falls back to HTTP/1.1."""
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    cg = _client(server, http2=True, timeout=(1, 5))
+    for _ in range(3):
+        assert cg.get_coin('bitcoin') == {'path': '/coins/bitcoin'}
+    with pytest.raises(HTTPError):
+        cg._request('missing')
+
+    assert cg.metrics.connections == {'new': 1, 'reused': 3}
+    assert cg.metrics.http_versions == {'HTTP/1.1': 4}
+    cg.close()
+
+
+def test_http2_errors():
+    """Test errors of httpx are converted to errors of requests."""
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    cg = CoinGeckoAPI(http2=True)
+    cg._ENDPOINT = 'http://127.0.0.1:9/'
+    with pytest.raises(ConnectionError):
+        cg.ping()
+    cg.close()
+
+
+def test_thread_safe(server):
+    """Test many threads sharing a client reuse their connections."""
+    cg = _client(server, thread_safe=True)
+    threads, calls = 8, 25
+
+    def work(n):
+        return [cg.get_coin(f'coin{n}') for _ in range(calls)]
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(work, range(threads)))
+
+    assert all(r == [{'path': f'/coins/coin{n}'}] * calls
+               for n, r in enumerate(results))
+    assert cg.metrics.connections['new'] <= threads
+    assert cg.metrics.connections['reused'] >= threads * (calls - 1)
+    assert server.connections <= threads
+    cg.close()
+
+
+def test_thread_safe_close(server):
+    """Test closing a client while other threads are calling it."""
+    cg = _client(server, thread_safe=True)
+    stop = threading.Event()
+    errors = []
+
+    def work():
+        while not stop.is_set():
+            try:
+                cg.ping()
+            except RuntimeError:
+                return
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    cg.close()
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert cg.session is None
+    assert errors == []
+    with pytest.raises(RuntimeError):
+        cg.ping()
+
+
+@pytest.mark.parametrize('compression', [True, False])
+def test_compression(server, compression):
+    """Test the bytes received before and after decoding are recorded."""
+    cg = _client(server, compression=compression)
+    data = cg.list_coins()
+    assert len(data['coins']) == 1000
+    with stream_to(io.BytesIO()):
+        result = cg.list_coins()
+
+    stats = cg.metrics.snapshot()['coins/list']
+    assert stats['bytes_decoded'] == 2 * result.size
+    if compression:
+        assert cg.metrics.encodings == {'gzip': 2}
+        assert stats['bytes_received'] < stats['bytes_decoded'] / 5
+    else:
+        assert cg.metrics.encodings == {'identity': 2}
+        assert stats['bytes_received'] == stats['bytes_decoded']
+    cg.close()
+
+
+def test_http2_compression(server):
+    """Test the HTTP/2 transport records the bytes received."""
+    pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    cg = _client(server, http2=True)
+    assert len(cg.list_coins()['coins']) == 1000
+
+    stats = cg.metrics.snapshot()['coins/list']
+    assert cg.metrics.encodings == {'gzip': 1}
+    assert 0 < stats['bytes_received'] < stats['bytes_decoded']
+    cg.close()
@@ -0,0 +1,85 @@
+import responses
+from coingecko_api import CoinGeckoAPI, view
+from coingecko_api.view import MarketView
+
+END_POINTS = 'https://api.coingecko.com/api/v3/'
+
+
+def _markets(category, page, json):
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/markets',
+                  match=[
+                      responses.matchers.query_param_matcher(
+                          {
+                              'vs_currency': 'usd',
+                              'category': category,
+                              'per_page': '2',
+                              'page': str(page)
+                          })
+                  ],
+                  json=json)
+
+
+def _coin(id, market_cap):
+    return {'id': id, 'market_cap': market_cap}
+
+
+@responses.activate
+def test_market_view(monkeypatch):
+    """Test joining the categories, markets and platforms."""
+    monkeypatch.setattr(view, 'MARKETS_PER_PAGE', 2)
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/categories',
+                  json=[{'id': 'layer-1'}, {'id': 'meme'}])
+    responses.add(responses.GET,
+                  END_POINTS + 'coins/list',
+                  match=[
+                      responses.matchers.query_param_matcher(
+                          {'include_platform': 'true'})
+                  ],
+                  json=[{'id': 'ethereum', 'platforms': {}},
+                        {'id': 'pepe', 'platforms': {'ethereum': '0x69'}},
+                        {'id': 'bonk', 'platforms': {'solana': 'Dez'}},
+                        {'id': 'shiba', 'platforms': {'ethereum': '0x95',
+                                                      '': ''}}])
+    _markets('layer-1', 1, [_coin('bitcoin', 10), _coin('ethereum', 5)])
+    _markets('layer-1', 2, [_coin('solana', None)])
+    _markets('meme', 1, [_coin('pepe', 2), _coin('shiba', 3)])
+    _markets('meme', 2, [])
+
+    mv = MarketView(CoinGeckoAPI(), workers=2)
+    assert mv.refresh() == 2
+    assert len(mv) == 5
+    assert mv.ids(platform='ethereum') == {'pepe', 'shiba'}
+    assert mv.platforms_of('shiba') == {'ethereum': '0x95'}
+    assert [c['id'] for c in mv.top(2)] == ['bitcoin', 'ethereum']
+    assert [c['id'] for c in mv.top(5, category='layer-1')] == \
+        ['bitcoin', 'ethereum']
+    assert [c['id'] for c in mv.top(1, 'meme', 'ethereum', ascending=True)
+            ] == ['pepe']
+    assert mv.top(3, platform='solana') == []
+    assert mv.top(0) == []
+
+    # fresh categories and listings are not fetched again
+    calls = len(responses.calls)
+    assert mv.refresh() == 0
+    assert len(responses.calls) == calls
+
+
+def test_update_category():
+    """Test coins of a category are replaced in place."""
+    mv = MarketView(CoinGeckoAPI())
+    mv.update_category('meme', [_coin('pepe', 2), _coin('doge', 20)])
+    mv.update_category('layer-1', [_coin('doge', 30)])
+    assert mv.categories_of('doge') == {'meme', 'layer-1'}
+    assert [c['id'] for c in mv.top(1, category='meme')] == ['doge']
+    assert mv.get('doge')['market_cap'] == 30
+
+    mv.update_category('meme', [_coin('pepe', 4)])
+    assert mv.categories_of('doge') == {'layer-1'}
+    assert [c['id'] for c in mv.top(category='meme')] == ['pepe']
+
+    # coins left in no category are dropped
+    mv.update_categories([{'id': 'layer-1'}])
+    assert 'pepe' not in mv
+    assert mv.ids() == {'doge'}
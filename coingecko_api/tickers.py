@@ -0,0 +1,172 @@
+import threading
+import time
+from typing import (TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional,
+                    Set, Tuple)
+
+from .crawl import TICKERS_PER_PAGE, fetch_pages, imap_unordered
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+
+class Quote(NamedTuple):
+    """Ticker of a pair on an exchange."""
+    exchange: str
+    last: Optional[float]
+    volume: Optional[float]
+    spread: Optional[float]
+    converted_last_usd: Optional[float]
+    converted_volume_usd: Optional[float]
+    timestamp: Optional[str]
+
+
+def fetch_exchange_tickers(cg: 'CoinGeckoAPI',
+                           id: str,
+                           params: Optional[dict] = None) -> List[dict]:
+    """Get the tickers of every page of `get_exchange_tickers`."""
+
+    def fetch_page(page: int) -> List[dict]:
+        data = cg.get_exchange_tickers(id, dict(params or {}, page=page))
+        return data.get('tickers') or []
+
+    return fetch_pages(fetch_page, TICKERS_PER_PAGE)
+
+
+def _quote(exchange: str, ticker: dict) -> Quote:
+    converted_last = ticker.get('converted_last') or {}
+    converted_volume = ticker.get('converted_volume') or {}
+    return Quote(exchange, ticker.get('last'), ticker.get('volume'),
+                 ticker.get('bid_ask_spread_percentage'),
+                 converted_last.get('usd'), converted_volume.get('usd'),
+                 ticker.get('timestamp'))
+
+
+class TickerIndex:
+    """In-memory index of the tickers of every exchange by pair.
+
+    Exchanges are fetched concurrently under the rate limiter of the client.
+    Refreshing only fetches the exchanges older than `max_age`, and replaces
+    their quotes in place; lookups by pair are O(1).
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        workers (int): Number of exchanges fetched concurrently.
+        max_age (float): Seconds before the tickers of an exchange are stale.
+        include_stale (bool): Keep tickers flagged `is_stale` by CoinGecko.
+
+    Attributes:
+        errors (dict): Exception per exchange of the last refresh.
+
+    Example:
+        >>> index = TickerIndex(cg)
+        >>> index.refresh()
+        >>> index.best('BTC', 'USDT')
+    """
+
+    def __init__(self,
+                 cg: 'CoinGeckoAPI',
+                 workers: int = 8,
+                 max_age: float = 300.0,
+                 include_stale: bool = False) -> None:
+        self.cg = cg
+        self.workers = workers
+        self.max_age = max_age
+        self.include_stale = include_stale
+        self.errors: Dict[str, Exception] = {}
+        self._pairs: Dict[Tuple[str, str], Dict[str, Quote]] = {}
+        self._by_exchange: Dict[str, Set[Tuple[str, str]]] = {}
+        self._fetched: Dict[str, float] = {}
+        self._exchanges: Optional[List[str]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def exchanges(self) -> List[str]:
+        """Get the ids of all exchanges, fetched once."""
+        if self._exchanges is None:
+            self._exchanges = [item['id'] for item in self.cg.list_exchanges()]
+        return self._exchanges
+
+    def update(self, exchange: str, tickers: Iterable[dict]) -> None:
+        """Replace the quotes of an exchange."""
+        quotes: Dict[Tuple[str, str], Quote] = {}
+        for ticker in tickers:
+            if ticker.get('is_stale') and not self.include_stale:
+                continue
+            pair = (ticker['base'].upper(), ticker['target'].upper())
+            quotes[pair] = _quote(exchange, ticker)
+
+        with self._lock:
+            for pair in self._by_exchange.get(exchange, ()):
+                if pair not in quotes:
+                    venues = self._pairs[pair]
+                    del venues[exchange]
+                    if not venues:
+                        del self._pairs[pair]
+            for pair, quote in quotes.items():
+                self._pairs.setdefault(pair, {})[exchange] = quote
+            self._by_exchange[exchange] = set(quotes)
+            self._fetched[exchange] = time.monotonic()
+
+    def refresh(self,
+                exchanges: Optional[Iterable[str]] = None,
+                force: bool = False) -> int:
+        """Fetch the tickers of the stale exchanges.
+
+        Args:
+            exchanges (list): Ids of the exchanges, all of them by default.
+            force (bool): Fetch the exchanges even if they are fresh.
+
+        Returns:
+            int: Number of exchanges refreshed.
+        """
+        now = time.monotonic()
+        ids = list(exchanges) if exchanges is not None else self.exchanges()
+        stale = [
+            id for id in ids
+            if force or now - self._fetched.get(id, float('-inf')) >=
+            self.max_age
+        ]
+        self.errors = {}
+        if not stale:
+            return 0
+
+        refreshed = 0
+        for id, error in imap_unordered(self._refresh,
+                                        stale,
+                                        self.workers,
+                                        return_exceptions=True):
+            if error is not None:
+                self.errors[id] = error
+            else:
+                refreshed += 1
+        return refreshed
+
+    def _refresh(self, exchange: str) -> None:
+        self.update(exchange, fetch_exchange_tickers(self.cg, exchange))
+
+    def get(self, base: str, target: str) -> Dict[str, Quote]:
+        """Get the quotes of a pair per exchange."""
+        return dict(self._pairs.get((base.upper(), target.upper()), {}))
+
+    def best(self,
+             base: str,
+             target: str,
+             by: str = 'volume') -> Optional[Quote]:
+        """Get the quote of a pair with the highest volume or lowest spread.
+
+        Args:
+            by (str): `volume` or `spread`.
+        """
+        if by not in ('volume', 'spread'):
+            raise ValueError("by should be 'volume' or 'spread'.")
+        quotes = [
+            quote for quote in self.get(base, target).values()
+            if getattr(quote, by) is not None
+        ]
+        if not quotes:
+            return None
+        if by == 'volume':
+            return max(quotes, key=lambda quote: quote.volume)
+        return min(quotes, key=lambda quote: quote.spread)
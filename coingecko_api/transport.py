@@ -0,0 +1,208 @@
+"""Transports sending the prepared requests of `CoinGeckoAPI`.
+
+They flag the responses with the HTTP version and whether they were sent on
+a new connection, so that connection reuse shows in the metrics of the
+client, as well as the bytes received before and after decoding:
+
+- `create_session()`: `requests.Session` over HTTP/1.1 (default)
+- `ThreadLocalSession`: one `requests.Session` per thread, for clients
+  shared by many threads
+- `HTTP2Session`: `httpx.Client` multiplexing concurrent calls over one
+  HTTP/2 connection, falling back to HTTP/1.1 when the server does not
+  negotiate HTTP/2. Requires `pip install httpx[http2]`.
+"""
+import datetime
+import functools
+import threading
+import weakref
+from typing import Iterable, Optional, Tuple, Union
+
+from requests import PreparedRequest, Response, Session
+from requests import exceptions as rexc
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+_VERSIONS = {10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}
+# content codings by preference, if a decoder is installed
+_CODINGS = ('zstd', 'br', 'gzip', 'deflate')
+
+
+@functools.lru_cache(maxsize=None)
+def accept_encoding() -> str:
+    """Get the `Accept-Encoding` of the content codings which can be
+    decoded, best first.
+
+    `gzip` and `deflate` are always supported, `br` and `zstd` with the
+    `brotli` and `zstandard` packages, e.g.,
+    `pip install coingecko-api[compression]`.
+    """
+    from urllib3.util.request import ACCEPT_ENCODING
+    available = set(ACCEPT_ENCODING.split(','))
+    return ', '.join(coding for coding in _CODINGS if coding in available)
+
+
+def transfer_size(response: Response) -> Optional[int]:
+    """Get the bytes of the body received on the wire, before decoding.
+
+    Returns:
+        int: Bytes read so far, None if unknown, e.g., replayed responses.
+    """
+    size = getattr(response, 'wire_bytes', None)
+    if size is None:
+        tell = getattr(response.raw, 'tell', None)
+        if tell is not None:
+            size = tell()
+    return size
+
+
+def build_response(request: PreparedRequest, status: int,
+                   headers: Iterable[Tuple[str, str]], content: bytes,
+                   reason: str, elapsed: datetime.timedelta) -> Response:
+    """Build a `requests.Response` from its parts."""
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.reason = reason
+    response.url = request.url
+    response.request = request
+    response.elapsed = elapsed
+    response.http_version = None
+    response.new_connection = None
+    response.wire_bytes = None
+    return response
+
+
+class MeteredAdapter(HTTPAdapter):
+    """`HTTPAdapter` flagging the responses sent on a new connection."""
+
+    def build_response(self, req, resp) -> Response:
+        response = super().build_response(req, resp)
+        conn = getattr(resp, 'connection', None)
+        response.http_version = _VERSIONS.get(getattr(resp, 'version', None))
+        response.new_connection = (conn is not None and
+                                   not getattr(conn, '_coingecko_used', False))
+        if conn is not None:
+            conn._coingecko_used = True
+        return response
+
+
+def create_session() -> Session:
+    """Create a `requests.Session` with metered adapters."""
+    session = Session()
+    session.mount('https://', MeteredAdapter())
+    session.mount('http://', MeteredAdapter())
+    return session
+
+
+class _Holder:
+    """Session of a thread, closed when the thread exits."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        weakref.finalize(self, session.close)
+
+
+class ThreadLocalSession:
+    """The `requests.Session` interface used by the client, with one session
+    per thread.
+
+    `requests.Session` is not documented as thread-safe, so each thread
+    sends its requests on its own session and reuses its own connections.
+    The session of a thread is closed when the thread exits. Once `close()`
+    started, sending raises `RuntimeError`; requests already sent complete.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._holders: 'weakref.WeakSet[_Holder]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _session(self) -> Session:
+        holder: Optional[_Holder] = getattr(self._local, 'holder', None)
+        if holder is None:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError('Session is already closed.')
+                holder = self._local.holder = _Holder(create_session())
+                self._holders.add(holder)
+        return holder.session
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if self._closed:
+            raise RuntimeError('Session is already closed.')
+        return self._session().send(request, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            holders = list(self._holders)
+        for holder in holders:
+            holder.session.close()
+
+
+class HTTP2Session:
+    """The `requests.Session` interface used by the client, over HTTP/2.
+
+    Responses and exceptions are converted to their `requests` counterparts,
+    so the rest of the client is unaware of the transport. `httpx.Client` is
+    thread-safe, so all threads share its connections.
+
+    Args:
+        http2 (bool): Negotiate HTTP/2, otherwise use HTTP/1.1.
+        **kwargs: Additional keyword arguments to pass in `httpx.Client`,
+            e.g., `limits`.
+    """
+
+    def __init__(self, http2: bool = True, **kwargs) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError('HTTP/2 requires httpx, '
+                              'e.g., pip install httpx[http2]') from e
+        self._httpx = httpx
+        self.client = httpx.Client(http2=http2, **kwargs)
+        self._streams: 'weakref.WeakSet' = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def _timeout(self, timeout: Union[float, Tuple[float, float], None]):
+        if isinstance(timeout, tuple):
+            return self._httpx.Timeout(timeout[1], connect=timeout[0])
+        return self._httpx.Timeout(timeout)
+
+    def send(self,
+             request: PreparedRequest,
+             timeout: Union[float, Tuple[float, float], None] = None,
+             **kwargs) -> Response:
+        httpx = self._httpx
+        try:
+            r = self.client.request(request.method,
+                                    request.url,
+                                    headers=dict(request.headers),
+                                    content=request.body,
+                                    timeout=self._timeout(timeout))
+        except httpx.ConnectTimeout as e:
+            raise rexc.ConnectTimeout(e, request=request) from e
+        except httpx.TimeoutException as e:
+            raise rexc.ReadTimeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise rexc.ConnectionError(e, request=request) from e
+
+        response = build_response(request, r.status_code, r.headers.items(),
+                                  r.content, r.reason_phrase, r.elapsed)
+        response.url = str(r.url)
+        response.http_version = r.http_version
+        response.wire_bytes = r.num_bytes_downloaded
+        stream = r.extensions.get('network_stream')
+        if stream is not None:
+            with self._lock:
+                response.new_connection = stream not in self._streams
+                self._streams.add(stream)
+        return response
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,252 @@
+"""In-memory view joining categories, markets and platforms of the coins.
+
+`MarketView` loads `list_coins_categories_market`, every page of
+`list_coins_markets` per category and `list_coins(include_platform)` once,
+and indexes the coins by id, category and platform. Sorted queries are
+cached until the next update, so repeated top-N queries are slices.
+
+Example:
+    >>> view = MarketView(cg)
+    >>> view.refresh()
+    >>> view.top(10, category='layer-1', platform='ethereum')
+"""
+import threading
+import time
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set,
+                    Tuple)
+
+from .crawl import MARKETS_PER_PAGE, fetch_pages, imap_unordered
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import CoinGeckoAPI
+
+# keys of the listings in `_fetched`
+_CATEGORIES = ('categories', )
+_PLATFORMS = ('platforms', )
+
+
+def fetch_category_markets(cg: 'CoinGeckoAPI',
+                           category: str,
+                           vs_currency: str = 'usd',
+                           params: Optional[dict] = None) -> List[dict]:
+    """Get the markets of every page of `list_coins_markets` in a
+    category."""
+
+    def fetch_page(page: int) -> List[dict]:
+        _params = dict(params or {},
+                       category=category,
+                       per_page=MARKETS_PER_PAGE,
+                       page=page)
+        return cg.list_coins_markets(vs_currency, _params) or []
+
+    return fetch_pages(fetch_page, MARKETS_PER_PAGE)
+
+
+class MarketView:
+    """Markets of the coins indexed by id, category and platform.
+
+    Categories are fetched concurrently under the rate limiter of the
+    client. Refreshing only fetches the categories and listings older than
+    `max_age`, and replaces their coins in place.
+
+    Args:
+        cg (CoinGeckoAPI): Client used for the calls.
+        vs_currency (str): Currency of the markets.
+        workers (int): Number of categories fetched concurrently.
+        max_age (float): Seconds before a category or listing is stale.
+        params (dict): Additional parameters of `list_coins_markets`, e.g.,
+            `{'price_change_percentage': '7d'}`.
+
+    Attributes:
+        errors (dict): Exception per category of the last refresh.
+    """
+
+    def __init__(self,
+                 cg: 'CoinGeckoAPI',
+                 vs_currency: str = 'usd',
+                 workers: int = 4,
+                 max_age: float = 300.0,
+                 params: Optional[Dict[str, Any]] = None) -> None:
+        self.cg = cg
+        self.vs_currency = vs_currency
+        self.workers = workers
+        self.max_age = max_age
+        self.params = params
+        self.errors: Dict[str, Exception] = {}
+        self._categories: Dict[str, dict] = {}
+        self._coins: Dict[str, dict] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._categories_of: Dict[str, Set[str]] = {}
+        self._platforms: Dict[str, Dict[str, str]] = {}
+        self._by_platform: Dict[str, Set[str]] = {}
+        self._fetched: Dict[Any, float] = {}
+        self._orders: Dict[Tuple[Optional[str], Optional[str], str],
+                           List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._coins)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._coins
+
+    def update_categories(self, categories: Iterable[dict]) -> None:
+        """Replace the categories, dropping the coins of removed ones."""
+        rows = {row['id']: row for row in categories}
+        with self._lock:
+            for category in set(self._by_category) - set(rows):
+                self._remove_category(category)
+                self._fetched.pop(category, None)
+            self._categories = rows
+            self._fetched[_CATEGORIES] = time.monotonic()
+            self._orders = {}
+
+    def update_category(self, category: str, markets: Iterable[dict]) -> None:
+        """Replace the coins of a category with their markets."""
+        rows = {row['id']: row for row in markets}
+        with self._lock:
+            self._remove_category(category)
+            for id, row in rows.items():
+                self._coins[id] = row
+                self._categories_of.setdefault(id, set()).add(category)
+            self._by_category[category] = set(rows)
+            self._fetched[category] = time.monotonic()
+            self._orders = {}
+
+    def _remove_category(self, category: str) -> None:
+        for id in self._by_category.pop(category, ()):
+            categories = self._categories_of[id]
+            categories.discard(category)
+            if not categories:
+                # markets are only fetched per category
+                del self._categories_of[id]
+                del self._coins[id]
+
+    def update_platforms(self, coins: Iterable[dict]) -> None:
+        """Replace the contract addresses of the coins per platform."""
+        platforms: Dict[str, Dict[str, str]] = {}
+        by_platform: Dict[str, Set[str]] = {}
+        for coin in coins:
+            addresses = {
+                platform: address
+                for platform, address in (coin.get('platforms') or {}).items()
+                if platform and address
+            }
+            if addresses:
+                platforms[coin['id']] = addresses
+                for platform in addresses:
+                    by_platform.setdefault(platform, set()).add(coin['id'])
+        with self._lock:
+            self._platforms = platforms
+            self._by_platform = by_platform
+            self._fetched[_PLATFORMS] = time.monotonic()
+            self._orders = {}
+
+    def _stale(self, key: Any, now: float, force: bool) -> bool:
+        return (force or
+                now - self._fetched.get(key, float('-inf')) >= self.max_age)
+
+    def refresh(self,
+                categories: Optional[Iterable[str]] = None,
+                force: bool = False) -> int:
+        """Fetch the stale listings and categories.
+
+        Args:
+            categories (list): Ids of the categories, all of them by default.
+            force (bool): Fetch them even if they are fresh.
+
+        Returns:
+            int: Number of categories refreshed.
+        """
+        now = time.monotonic()
+        if self._stale(_CATEGORIES, now, force):
+            self.update_categories(self.cg.list_coins_categories_market())
+        if self._stale(_PLATFORMS, now, force):
+            self.update_platforms(
+                self.cg.list_coins({'include_platform': 'true'}))
+
+        ids = list(categories) if categories is not None else list(
+            self._categories)
+        stale = [id for id in ids if self._stale(id, now, force)]
+        self.errors = {}
+        if not stale:
+            return 0
+
+        refreshed = 0
+        for id, error in imap_unordered(self._refresh,
+                                        stale,
+                                        self.workers,
+                                        return_exceptions=True):
+            if error is not None:
+                self.errors[id] = error
+            else:
+                refreshed += 1
+        return refreshed
+
+    def _refresh(self, category: str) -> None:
+        self.update_category(
+            category,
+            fetch_category_markets(self.cg, category, self.vs_currency,
+                                   self.params))
+
+    def get(self, id: str) -> Optional[dict]:
+        """Get the market of a coin."""
+        return self._coins.get(id)
+
+    def category(self, id: str) -> Optional[dict]:
+        """Get the market data of a category."""
+        return self._categories.get(id)
+
+    def categories_of(self, id: str) -> Set[str]:
+        """Get the ids of the categories of a coin."""
+        return set(self._categories_of.get(id, ()))
+
+    def platforms_of(self, id: str) -> Dict[str, str]:
+        """Get the contract address of a coin per platform."""
+        return dict(self._platforms.get(id, {}))
+
+    def ids(self,
+            category: Optional[str] = None,
+            platform: Optional[str] = None) -> Set[str]:
+        """Get the ids of the coins in a category and on a platform."""
+        with self._lock:
+            return set(self._select(category, platform))
+
+    def _select(self, category: Optional[str],
+                platform: Optional[str]) -> Iterable[str]:
+        ids: Iterable[str] = self._coins
+        if category is not None:
+            ids = self._by_category.get(category, set())
+        if platform is not None:
+            ids = self._by_platform.get(platform, set()).intersection(ids)
+        return ids
+
+    def top(self,
+            n: int = 10,
+            category: Optional[str] = None,
+            platform: Optional[str] = None,
+            by: str = 'market_cap',
+            ascending: bool = False) -> List[dict]:
+        """Get the markets of the coins with the largest (or smallest) value
+        of a field, in a category and on a platform.
+
+        Coins without a value of the field are left out. The order of a
+        filter is sorted once and kept until the next update.
+
+        Example:
+            >>> view.top(5, platform='solana', by='price_change_percentage_24h')
+        """
+        key = (category, platform, by)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is None:
+                ids = [
+                    id for id in self._select(category, platform)
+                    if self._coins[id].get(by) is not None
+                ]
+                ids.sort(key=lambda id: self._coins[id][by])
+                order = self._orders[key] = ids
+            coins = self._coins
+            if ascending:
+                return [coins[id] for id in order[:n]]
+            return [coins[id] for id in order[:-n - 1:-1]] if n > 0 else []
@@ -16,6 +16,12 @@ setup(name='coingecko-api',
       author='Yu-Han Luo',
       author_email='yuhanluo1994@gmail.com',
       install_requires=['requests'],
+      extras_require={
+          'analytics': ['numpy'],
+          'compression': ['brotli', 'zstandard'],
+          'http2': ['httpx[http2]'],
+          'parquet': ['pyarrow']
+      },
       classifiers=[
           "Programming Language :: Python :: 3",
           "License :: OSI Approved :: MIT License",